@@ -1,20 +1,140 @@
-from datetime import datetime
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, Optional
 
 from bson import ObjectId
+from bson.errors import InvalidId
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
 
 from ..api.auth import get_current_user
+from ..core.config import settings
 from ..core.database import get_experiences_collection, get_solutions_collection
-from ..services.ai_service import AIService
+from ..services.ai_service import AIService, get_ai_service
 
 router = APIRouter()
-ai_service = AIService()
 
 
-@router.post("/process/{experience_id}/{stage}", response_model=dict)
+class ProcessResponse(BaseModel):
+    """Response for processing an experience stage.
+
+    ``stage`` and ``content`` are omitted when the stage was already processed.
+    """
+
+    id: str
+    stage: Optional[int] = None
+    content: Optional[Dict[str, Any]] = None
+    message: str
+
+
+class RegenerateResponse(BaseModel):
+    """Response for regenerating a low-rated solution."""
+
+    id: str
+    content: Dict[str, Any]
+    message: str
+
+
+# Experience fields read by AIService.process_experience/regenerate_solution.
+# Fetching only these keeps the driver from decoding media references and
+# other metadata the AI pipeline never looks at.
+_EXPERIENCE_AI_PROJECTION = {
+    "title": 1,
+    "content": 1,
+    "category": 1,
+    "emotionalState": 1,
+    "userRole": 1,
+}
+_SOLUTION_REGENERATE_PROJECTION = {
+    "_id": 1,
+    "stage": 1,
+    "experienceId": 1,
+    "userFeedback": 1,
+}
+
+# Fixed fields of a freshly generated solution. Read-only so a request can't
+# mutate the shared copy; each document gets its own analytics dict because
+# the counters are updated in place later.
+_DEFAULT_ANALYTICS = MappingProxyType(
+    {"viewCount": 0, "shareCount": 0, "effectivenessScore": None}
+)
+_SOLUTION_TEMPLATE = MappingProxyType({"status": "generated"})
+
+# experiences.metadata.processingStage value for each valid stage (index 0 unused)
+_STAGE_STRS = (None, "stage1", "stage2", "stage3")
+
+# Recently seen (userId, experienceId, stage) -> solution id. Retries and
+# double-submits for a stage that is already processed are answered from here
+# without a Mongo round-trip.
+_existing_solution_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# (userId, experienceId, stage) -> task currently processing that stage
+_in_flight_processing: dict[tuple[str, str, int], asyncio.Task] = {}
+
+
+@dataclass(slots=True)
+class _SolutionView:
+    """Fields of a claimed solution that regenerate_solution works with."""
+
+    id: ObjectId
+    stage: int
+    experience_id: str
+    user_feedback: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_doc(cls, doc: Dict[str, Any]) -> "_SolutionView":
+        return cls(
+            id=doc["_id"],
+            stage=doc["stage"],
+            experience_id=doc["experienceId"],
+            user_feedback=doc.get("userFeedback"),
+        )
+
+
+def _parse_object_id(value: str, name: str) -> ObjectId:
+    """Convert a path parameter to an ObjectId, rejecting malformed ids with 400."""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} ID"
+        )
+
+
+def _forget_in_flight(key: tuple[str, str, int], task: asyncio.Task) -> None:
+    """Drop a finished processing task from the in-flight registry."""
+    _in_flight_processing.pop(key, None)
+    if not task.cancelled():
+        # Mark the outcome as retrieved even if every waiter has gone away
+        task.exception()
+
+
+async def _release_regeneration_claim(solutions_collection, sol_oid: ObjectId) -> None:
+    """Return a solution claimed by regenerate_solution to the generated state."""
+    await solutions_collection.update_one(
+        {"_id": sol_oid, "status": "regenerating"}, {"$set": {"status": "generated"}}
+    )
+
+
+@router.post(
+    "/process/{experience_id}/{stage}",
+    response_model=ProcessResponse,
+    response_model_exclude_none=True,
+    response_class=ORJSONResponse,
+)
 async def process_experience(
-    experience_id: str, stage: int, current_user: dict = Depends(get_current_user)
-):
+    experience_id: str,
+    stage: int,
+    current_user: dict = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
+) -> Dict[str, Any]:
     """Process an experience through AI pipeline."""
     if stage not in [1, 2, 3]:
         raise HTTPException(
@@ -22,12 +142,59 @@ async def process_experience(
             detail="Invalid stage. Must be 1, 2, or 3",
         )
 
+    exp_oid: ObjectId = _parse_object_id(experience_id, "experience")
+    user_id_str: str = str(current_user["_id"])
+
+    cache_key: tuple[str, str, int] = (user_id_str, experience_id, stage)
+    cached_solution_id = _existing_solution_cache.get(cache_key)
+    if cached_solution_id is not None:
+        return {
+            "id": cached_solution_id,
+            "message": "Solution already exists for this stage",
+        }
+
+    # Coalesce duplicate in-flight requests (double clicks, client retries)
+    # onto a single pipeline run instead of calling the AI service twice.
+    task = _in_flight_processing.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _process_experience(experience_id, exp_oid, stage, user_id_str, ai_service)
+        )
+        _in_flight_processing[cache_key] = task
+        task.add_done_callback(partial(_forget_in_flight, cache_key))
+
+    # Shielded so one caller disconnecting doesn't cancel the shared run
+    return await asyncio.shield(task)
+
+
+async def _process_experience(
+    experience_id: str,
+    exp_oid: ObjectId,
+    stage: int,
+    user_id_str: str,
+    ai_service: AIService,
+) -> Dict[str, Any]:
+    """Run the AI pipeline for one experience stage and store the solution."""
+    cache_key: tuple[str, str, int] = (user_id_str, experience_id, stage)
+
     experiences_collection = get_experiences_collection()
     solutions_collection = get_solutions_collection()
 
-    # Get experience
-    experience = await experiences_collection.find_one(
-        {"_id": ObjectId(experience_id), "userId": str(current_user["_id"])}
+    # Matches the unique (userId, experienceId, stage) index on solutions
+    solution_key: Dict[str, Any] = {
+        "experienceId": experience_id,
+        "userId": user_id_str,
+        "stage": stage,
+    }
+
+    # Get experience and check for an existing solution for this stage.
+    # The two lookups are independent, so issue them concurrently.
+    experience, existing_solution = await asyncio.gather(
+        experiences_collection.find_one(
+            {"_id": exp_oid, "userId": user_id_str},
+            projection=_EXPERIENCE_AI_PROJECTION,
+        ),
+        solutions_collection.find_one(solution_key, projection={"_id": 1}),
     )
 
     if not experience:
@@ -35,58 +202,89 @@ async def process_experience(
             status_code=status.HTTP_404_NOT_FOUND, detail="Experience not found"
         )
 
-    # Check if solution for this stage already exists
-    existing_solution = await solutions_collection.find_one(
-        {
-            "experienceId": experience_id,
-            "userId": str(current_user["_id"]),
-            "stage": stage,
-        }
-    )
-
     if existing_solution:
+        solution_id = str(existing_solution["_id"])
+        _existing_solution_cache[cache_key] = solution_id
         return {
-            "id": str(existing_solution["_id"]),
+            "id": solution_id,
             "message": "Solution already exists for this stage",
         }
 
     try:
         # Process through AI service
-        solution_data = await ai_service.process_experience(experience, stage)
+        # Bounded so a hung upstream can't hold the request open indefinitely
+        solution_data = await asyncio.wait_for(
+            ai_service.process_experience(experience, stage),
+            timeout=settings.AI_PROCESSING_TIMEOUT_SECONDS,
+        )
+
+        # One timestamp shared by the solution and the experience update
+        now: datetime = datetime.now(timezone.utc)
 
-        # Save solution to database
-        solution_doc = {
-            "userId": str(current_user["_id"]),
+        # Save solution to database. userId/experienceId stay hex strings: the
+        # solutions router and the stage routers store and query them that way,
+        # and the unique (userId, experienceId, stage) index is keyed on them.
+        solution_doc: Dict[str, Any] = {
+            **_SOLUTION_TEMPLATE,
+            "userId": user_id_str,
             "experienceId": experience_id,
             "stage": stage,
             "content": solution_data["content"],
             "aiMetadata": solution_data["metadata"],
-            "status": "generated",
-            "analytics": {"viewCount": 0, "shareCount": 0, "effectivenessScore": None},
-            "createdAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow(),
+            "analytics": dict(_DEFAULT_ANALYTICS),
+            "createdAt": now,
+            "updatedAt": now,
         }
 
-        result = await solutions_collection.insert_one(solution_doc)
-
-        # Update experience processing stage
-        await experiences_collection.update_one(
-            {"_id": ObjectId(experience_id)},
-            {
-                "$set": {
-                    "metadata.processingStage": f"stage{stage}",
-                    "updatedAt": datetime.utcnow(),
-                }
-            },
-        )
+        # Save the solution and advance the experience processing stage in
+        # parallel; the writes target different collections and do not depend
+        # on each other.
+        try:
+            result, _ = await asyncio.gather(
+                solutions_collection.insert_one(solution_doc),
+                experiences_collection.update_one(
+                    {"_id": exp_oid},
+                    {
+                        "$set": {
+                            "metadata.processingStage": _STAGE_STRS[stage],
+                            "updatedAt": now,
+                        }
+                    },
+                ),
+            )
+        except DuplicateKeyError:
+            # A concurrent request stored this stage first and the unique
+            # index rejected our insert; report the winner's solution.
+            existing_solution = await solutions_collection.find_one(
+                solution_key, projection={"_id": 1}
+            )
+            solution_id = str(existing_solution["_id"])
+            _existing_solution_cache[cache_key] = solution_id
+            return {
+                "id": solution_id,
+                "message": "Solution already exists for this stage",
+            }
+
+        solution_id = str(result.inserted_id)
+        _existing_solution_cache[cache_key] = solution_id
 
         return {
-            "id": str(result.inserted_id),
+            "id": solution_id,
             "stage": stage,
             "content": solution_data["content"],
             "message": "Experience processed successfully",
         }
 
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="AI processing timed out",
+        )
+    except PyMongoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save solution: {str(e)}",
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -94,59 +292,95 @@ async def process_experience(
         )
 
 
-@router.post("/regenerate/{solution_id}", response_model=dict)
+@router.post(
+    "/regenerate/{solution_id}",
+    response_model=RegenerateResponse,
+    response_class=ORJSONResponse,
+)
 async def regenerate_solution(
-    solution_id: str, current_user: dict = Depends(get_current_user)
-):
+    solution_id: str,
+    current_user: dict = Depends(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
+) -> Dict[str, Any]:
     """Regenerate a solution that received low rating."""
+    sol_oid: ObjectId = _parse_object_id(solution_id, "solution")
+    user_id_str: str = str(current_user["_id"])
+
     solutions_collection = get_solutions_collection()
     experiences_collection = get_experiences_collection()
 
-    # Get solution
-    solution = await solutions_collection.find_one(
-        {"_id": ObjectId(solution_id), "userId": str(current_user["_id"])}
+    # Claim the solution for regeneration in one round-trip. The filter only
+    # matches a low-rated solution that isn't already being regenerated, so two
+    # concurrent requests cannot both start regenerating it. A claim older
+    # than the AI timeout (plus a margin) was left by a worker that crashed or
+    # restarted mid-regeneration, so it may be taken over; claims made before
+    # regenerationStartedAt was recorded count as stale too.
+    now = datetime.now(timezone.utc)
+    stale_before = now - timedelta(seconds=settings.AI_PROCESSING_TIMEOUT_SECONDS + 60)
+    solution_doc = await solutions_collection.find_one_and_update(
+        {
+            "_id": sol_oid,
+            "userId": user_id_str,
+            "$or": [
+                {"status": {"$ne": "regenerating"}},
+                {"regenerationStartedAt": {"$not": {"$gte": stale_before}}},
+            ],
+            "userFeedback.rating": {"$lt": 50},
+        },
+        {"$set": {"status": "regenerating", "regenerationStartedAt": now}},
+        projection=_SOLUTION_REGENERATE_PROJECTION,
+        return_document=ReturnDocument.AFTER,
     )
 
-    if not solution:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Solution not found"
+    if not solution_doc:
+        # Nothing was claimed; look the solution up to report why
+        current = await solutions_collection.find_one(
+            {"_id": sol_oid, "userId": user_id_str},
+            projection={"status": 1},
         )
-
-    # Check if solution has low rating
-    if not solution.get("userFeedback") or solution["userFeedback"]["rating"] >= 50:
+        if not current:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Solution not found"
+            )
+        if current.get("status") == "regenerating":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Solution is already being regenerated",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Solution does not need regeneration",
         )
 
-    # Get experience
-    experience = await experiences_collection.find_one(
-        {"_id": ObjectId(solution["experienceId"])}
-    )
+    solution = _SolutionView.from_doc(solution_doc)
 
     try:
-        # Mark as regenerating
-        await solutions_collection.update_one(
-            {"_id": ObjectId(solution_id)}, {"$set": {"status": "regenerating"}}
+        # Get experience. This can't be folded into the claim above as a
+        # $lookup: the claim has to be an atomic find_one_and_update, and
+        # experienceId is stored as a hex string rather than an ObjectId.
+        exp_oid: ObjectId = ObjectId(solution.experience_id)
+        experience = await experiences_collection.find_one(
+            {"_id": exp_oid}, projection=_EXPERIENCE_AI_PROJECTION
         )
 
         # Process through AI service with previous feedback
-        solution_data = await ai_service.regenerate_solution(
-            experience, solution["stage"], solution["userFeedback"]
+        solution_data = await asyncio.wait_for(
+            ai_service.regenerate_solution(
+                experience, solution.stage, solution.user_feedback
+            ),
+            timeout=settings.AI_PROCESSING_TIMEOUT_SECONDS,
         )
 
         # Update solution
-        update_data = {
+        update_data: Dict[str, Any] = {
             "content": solution_data["content"],
             "aiMetadata": solution_data["metadata"],
             "status": "generated",
             "userFeedback": None,  # Clear previous feedback
-            "updatedAt": datetime.utcnow(),
+            "updatedAt": datetime.now(timezone.utc),
         }
 
-        await solutions_collection.update_one(
-            {"_id": ObjectId(solution_id)}, {"$set": update_data}
-        )
+        await solutions_collection.update_one({"_id": sol_oid}, {"$set": update_data})
 
         return {
             "id": solution_id,
@@ -154,12 +388,25 @@ async def regenerate_solution(
             "message": "Solution regenerated successfully",
         }
 
+    except asyncio.CancelledError:
+        # Client disconnected mid-regeneration. Release the claim so the
+        # solution isn't left stuck in "regenerating", then let it propagate.
+        await _release_regeneration_claim(solutions_collection, sol_oid)
+        raise
     except Exception as e:
-        # Reset status on error
-        await solutions_collection.update_one(
-            {"_id": ObjectId(solution_id)}, {"$set": {"status": "generated"}}
-        )
+        # Reset status on error so the solution can be regenerated again
+        await _release_regeneration_claim(solutions_collection, sol_oid)
 
+        if isinstance(e, asyncio.TimeoutError):
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Regeneration timed out",
+            )
+        if isinstance(e, PyMongoError):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to save regenerated solution: {str(e)}",
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Regeneration failed: {str(e)}",
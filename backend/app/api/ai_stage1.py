@@ -10,7 +10,8 @@ The processing flow:
 2. System validates experience ownership and checks for existing solutions
 3. Background task processes the experience through AI service
 4. Results are encrypted and stored in the database
-5. User can poll for status and retrieve completed results
+5. User can poll for status (or subscribe to the status stream) and retrieve
+   completed results
 
 Key Features:
 - Asynchronous background processing for better user experience
@@ -25,21 +26,276 @@ Dependencies:
 - MongoDB: For persistent storage of solutions and experiences
 """
 
-from datetime import datetime
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from hashlib import blake2b
 from typing import Any, Dict, Optional
 
+import orjson
 from bson import ObjectId
+from cachetools import TTLCache
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from pymongo import ReturnDocument, WriteConcern
+from pymongo.errors import DuplicateKeyError
 
+from ..core.config import settings
 from ..core.database import get_database
 from ..dependencies import get_current_user
 from ..models.solution import SolutionStatus
 from ..models.user import User
 from ..services.enhanced_ai_service import enhanced_ai_service
-from ..utils.field_encryption import decrypt_solution_data, encrypt_solution_data
+from ..utils.field_encryption import (
+    decrypt_solution_data_inplace,
+    encrypt_solution_data_inplace,
+)
+
+logger = logging.getLogger(__name__)
+
+# orjson serializes the responses, datetimes included, without the stdlib
+# json pass; StreamingResponse routes still return their own response
+router = APIRouter(
+    prefix="/api/ai/stage1",
+    tags=["ai-stage1"],
+    default_response_class=ORJSONResponse,
+)
+
+# Fields each endpoint reads from the solution/experience documents. Solutions
+# carry large encrypted content blobs, so lookups that don't render content
+# skip them instead of transferring and decoding them.
+# Status polling deliberately decodes into plain dicts rather than
+# RawBSONDocument: with this projection the server only returns the fields the
+# payload reads, and RawBSONDocument inflates every top-level field on first
+# access anyway, so lazy decoding would save nothing.
+_STATUS_PROJECTION = {
+    "userId": 1,  # Ownership is checked per caller on batched lookups
+    "status": 1,
+    "stage": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "processingStartedAt": 1,
+    "completedAt": 1,
+    "metadata.confidence_score": 1,
+    "errorMessage": 1,
+}
+_RESULT_PROJECTION = {
+    "status": 1,
+    "stage": 1,
+    "stageName": 1,
+    "content": 1,
+    "metadata": 1,
+    "aiMetadata": 1,
+    "createdAt": 1,
+    "completedAt": 1,
+    "_encryption": 1,  # Needed by decrypt_solution_data_inplace
+}
+_BACKGROUND_EXPERIENCE_PROJECTION = {"formData": 1}
+_MEDIA_PROJECTION = {"mediaType": 1, "mimeType": 1, "fileSize": 1}
+
+# Open status streams per solution id. Background jobs run in this process,
+# so a finished job pushes to its subscribers directly instead of each client
+# polling the status endpoint.
+_status_listeners: Dict[str, set] = {}
+# Idle streams re-check the database this often. This sends a keepalive for
+# proxies and picks up jobs that finished in another worker process.
+_STREAM_RECHECK_SECONDS = 15.0
+_FINAL_STATUSES = (SolutionStatus.COMPLETED, SolutionStatus.FAILED)
+
+# Concurrent status reads (polls and stream re-checks) are coalesced: lookups
+# arriving within this window share one {_id: {$in: [...]}} query. Pending
+# lookups map solution id -> future resolved with the document (or None).
+_STATUS_BATCH_WINDOW_SECONDS = 0.01
+_pending_status_lookups: Dict[ObjectId, asyncio.Future] = {}
+_status_flush_task: Optional[asyncio.Task] = None
+
+# (userId, experienceId) -> experience role for experiences recently confirmed
+# to belong to that user. Only successful checks are cached; the short TTL
+# bounds how long a deleted experience is still accepted here, and the
+# background job fails cleanly if it no longer exists.
+_experience_role_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+
+# solution id -> (owner user id, result payload) for completed Stage 1
+# solutions. Entries are dropped when the solution is regenerated or rewritten
+# by a background job in this process; the TTL bounds staleness when that
+# happens in another worker.
+_result_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+# Solution fields copied from the AI response cache into a solution record.
+# They are stored exactly as field encryption produced them, so cache hits are
+# written back without another AI call or encryption pass.
+_AI_CACHE_FIELDS = ("content", "aiMetadata", "_encryption")
+# Cache entries are a pure optimisation, so they are written unacknowledged
+_AI_CACHE_WRITE_CONCERN = WriteConcern(w=0)
+
+
+def _stage1_cache_key(
+    form_data: Dict[str, Any],
+    user_role: str,
+    additional_context: Dict[str, Any],
+    media_files: list,
+) -> str:
+    """Build a deterministic cache key for a Stage 1 AI request.
+
+    The key covers everything the AI service sees: the experience form data,
+    the user role, the extra context and the attached media files.
+    """
+    payload = json.dumps(
+        {
+            "form": form_data,
+            "role": user_role,
+            "ctx": additional_context,
+            "media_ids": sorted(str(media["_id"]) for media in media_files),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return blake2b(payload.encode(), digest_size=32).hexdigest()
+
+
+def _parse_object_id(value: str, name: str) -> ObjectId:
+    """Convert a client-supplied id to an ObjectId, rejecting malformed ids with 400.
+
+    ObjectId.is_valid checks the format without raising, so bad ids are
+    turned away before any database call instead of surfacing as a 500.
+    """
+    if not ObjectId.is_valid(value):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} ID"
+        )
+    return ObjectId(value)
+
+
+def _stage1_status_payload(solution_doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the status response for a solution loaded with _STATUS_PROJECTION.
+
+    Timestamps are left as datetimes; orjson writes them as ISO 8601 strings.
+    """
+    return {
+        "solution_id": str(solution_doc["_id"]),
+        "status": solution_doc["status"],
+        "stage": solution_doc["stage"],
+        "created_at": solution_doc.get("createdAt"),
+        "updated_at": solution_doc.get("updatedAt"),
+        "processing_started_at": solution_doc.get("processingStartedAt"),
+        "completed_at": solution_doc.get("completedAt"),
+        "confidence_score": solution_doc.get("metadata", {}).get(
+            "confidence_score", 0.0
+        ),
+        "error_message": solution_doc.get("errorMessage"),
+    }
+
+
+async def _flush_status_lookups(db) -> None:
+    """Resolve every pending status lookup with one batched query."""
+    global _status_flush_task
+    await asyncio.sleep(_STATUS_BATCH_WINDOW_SECONDS)
+    # Lookups arriving from here on start the next batch
+    batch = dict(_pending_status_lookups)
+    _pending_status_lookups.clear()
+    _status_flush_task = None
+
+    try:
+        docs = await db.solutions.find(
+            {"_id": {"$in": list(batch)}, "stage": 1},
+            projection=_STATUS_PROJECTION,
+        ).to_list(length=len(batch))
+    except Exception as e:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(e)
+        return
 
-router = APIRouter(prefix="/api/ai/stage1", tags=["ai-stage1"])
+    docs_by_id = {doc["_id"]: doc for doc in docs}
+    for solution_oid, future in batch.items():
+        if not future.done():
+            future.set_result(docs_by_id.get(solution_oid))
+
+
+async def _load_stage1_status(
+    db, solution_oid: ObjectId, user_id: str
+) -> Optional[Dict[str, Any]]:
+    """Read a Stage 1 solution with _STATUS_PROJECTION through the batcher.
+
+    Returns None if the solution doesn't exist or belongs to another user.
+    The document may be shared with other callers and must not be modified.
+    """
+    global _status_flush_task
+    future = _pending_status_lookups.get(solution_oid)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        _pending_status_lookups[solution_oid] = future
+        if _status_flush_task is None:
+            _status_flush_task = asyncio.create_task(_flush_status_lookups(db))
+
+    # Shielded so a client disconnecting doesn't cancel the lookup for
+    # others waiting on the same solution
+    solution_doc = await asyncio.shield(future)
+    if not solution_doc or solution_doc.get("userId") != user_id:
+        return None
+    return solution_doc
+
+
+def _notify_status_change(solution_id: str) -> None:
+    """Wake every status stream subscribed to this solution."""
+    for queue in _status_listeners.get(solution_id, ()):
+        queue.put_nowait(None)
+
+
+def _subscribe(listener_key: str) -> asyncio.Queue:
+    """Register a status stream for a solution and return its wake-up queue."""
+    queue: asyncio.Queue = asyncio.Queue()
+    _status_listeners.setdefault(listener_key, set()).add(queue)
+    return queue
+
+
+def _unsubscribe(listener_key: str, queue: asyncio.Queue) -> None:
+    """Remove a status stream, dropping the solution's entry once it's unused."""
+    listeners = _status_listeners.get(listener_key)
+    if listeners is not None:
+        listeners.discard(queue)
+        if not listeners:
+            del _status_listeners[listener_key]
+
+
+async def _stage1_event_stream(
+    db, solution_oid: ObjectId, user_id: str, queue: asyncio.Queue, doc: dict
+):
+    """Yield SSE events for a solution until it reaches a final status.
+
+    ``doc`` is the status already read by the endpoint; the stream owns the
+    subscription from then on and unsubscribes when it ends or the client
+    disconnects.
+    """
+    try:
+        while True:
+            yield b"data: " + orjson.dumps(_stage1_status_payload(doc)) + b"\n\n"
+            if doc["status"] in _FINAL_STATUSES:
+                return
+
+            # Wait for the background job to report back, re-checking the
+            # database periodically in case it ran in another worker
+            while True:
+                try:
+                    await asyncio.wait_for(queue.get(), _STREAM_RECHECK_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                # A finished job wakes every stream on the solution at
+                # once, so these re-reads share one batched query
+                latest = await _load_stage1_status(db, solution_oid, user_id)
+                if not latest:
+                    return
+                if latest["status"] != doc["status"]:
+                    doc = latest
+                    break
+                # Nothing changed: send an SSE comment so proxies don't
+                # drop the connection as idle
+                yield b": keepalive\n\n"
+    finally:
+        # Runs on normal completion and when the client disconnects
+        _unsubscribe(str(solution_oid), queue)
 
 
 class Stage1ProcessingRequest(BaseModel):
@@ -54,6 +310,8 @@ class Stage1ProcessingRequest(BaseModel):
             Can include user preferences, previous feedback, or specific instructions.
     """
 
+    # Validated by pydantic-core (Pydantic v2). Dict[str, Any] only checks the
+    # outer mapping and string keys; values are passed through unvalidated.
     experience_id: str
     priority: Optional[str] = "normal"  # normal, high
     additional_context: Optional[Dict[str, Any]] = None
@@ -65,7 +323,7 @@ class Stage1ProcessingResponse(BaseModel):
     Attributes:
         solution_id (str): MongoDB ObjectId of the created/updated solution record
         status (str): Current processing status
-            - "processing": Background task started successfully
+            - "processing": Background task started successfully, or already running
             - "already_exists": Solution already completed for this experience
         stage (int): Processing stage number (always 1 for this endpoint)
         processing_time (float): Time taken for initial processing (usually 0.0 for async)
@@ -81,6 +339,108 @@ class Stage1ProcessingResponse(BaseModel):
     message: str
 
 
+class Stage1StatusResponse(BaseModel):
+    """Response model for Stage 1 status checks and status stream events.
+
+    Attributes:
+        solution_id (str): MongoDB ObjectId of the solution record
+        status (str): Current processing status (processing, completed, failed)
+        stage (int): Processing stage number (always 1)
+        created_at, updated_at, processing_started_at, completed_at
+            (datetime, optional): Processing timeline, serialized as ISO 8601
+        confidence_score (float): AI confidence in the solution
+        error_message (str, optional): Failure reason when status is failed
+    """
+
+    solution_id: str
+    status: str
+    stage: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    processing_started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    confidence_score: float
+    error_message: Optional[str] = None
+
+
+class Stage1ResultResponse(BaseModel):
+    """Response model for a completed Stage 1 solution.
+
+    Attributes:
+        solution_id (str): MongoDB ObjectId of the solution record
+        stage (int): Processing stage number (always 1)
+        stage_name (str): Stage identifier (psychological_healing)
+        status (str): Processing status (always completed)
+        content (Dict[str, Any]): Decrypted solution content
+        metadata (Dict[str, Any]): Confidence score, processing time and role
+        aiMetadata (Dict[str, Any]): Decrypted AI generation metadata
+        created_at (datetime): When the solution was created
+        completed_at (datetime, optional): When processing finished
+    """
+
+    solution_id: str
+    stage: int
+    stage_name: str
+    status: str
+    content: Dict[str, Any]
+    metadata: Dict[str, Any]
+    aiMetadata: Dict[str, Any]
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+
+
+# Fixed-shape responses of the process endpoint, validated once at import.
+# Each request copies one and fills in its solution id (and score), skipping
+# field validation on the hot path.
+_ALREADY_EXISTS_RESPONSE = Stage1ProcessingResponse(
+    solution_id="",
+    status="already_exists",
+    stage=1,
+    processing_time=0.0,
+    confidence_score=0.0,
+    message="Stage 1 solution already exists for this experience",
+)
+_IN_PROGRESS_RESPONSE = Stage1ProcessingResponse(
+    solution_id="",
+    status="processing",
+    stage=1,
+    processing_time=0.0,
+    confidence_score=0.0,
+    message="Stage 1 processing already in progress",
+)
+_STARTED_RESPONSE = Stage1ProcessingResponse(
+    solution_id="",
+    status="processing",
+    stage=1,
+    processing_time=0.0,
+    confidence_score=0.0,
+    message="Stage 1 processing started successfully",
+)
+
+
+def _existing_stage1_response(
+    solution_doc: Dict[str, Any],
+) -> Optional[Stage1ProcessingResponse]:
+    """Response for a Stage 1 solution that must not be processed again.
+
+    Returns None when the solution can be (re)processed, e.g. after a failure.
+    """
+    if solution_doc.get("status") == SolutionStatus.COMPLETED:
+        return _ALREADY_EXISTS_RESPONSE.model_copy(
+            update={
+                "solution_id": str(solution_doc["_id"]),
+                "confidence_score": solution_doc.get("metadata", {}).get(
+                    "confidence_score", 0.0
+                ),
+            }
+        )
+    if solution_doc.get("status") == SolutionStatus.PROCESSING:
+        return _IN_PROGRESS_RESPONSE.model_copy(
+            update={"solution_id": str(solution_doc["_id"])}
+        )
+    return None
+
+
 @router.post("/process", response_model=Stage1ProcessingResponse)
 async def process_stage1(
     request: Stage1ProcessingRequest,
@@ -123,109 +483,132 @@ async def process_stage1(
     Processing Flow:
         1. Validates experience exists and belongs to current user
         2. Checks for existing Stage 1 solution to avoid duplicates
-        3. Creates or updates solution record with PROCESSING status
+        3. Atomically claims (creates or updates) the solution record with
+           PROCESSING status; concurrent submissions for the same experience
+           get the in-progress solution instead of a second AI run
         4. Starts background task for AI processing
         5. Returns solution ID for status polling
     """
     try:
-        # Validate experience exists and belongs to user
-        # This ensures data privacy and prevents unauthorized access to other users' experiences
-        experience_doc = await db.experiences.find_one(
-            {
-                "_id": ObjectId(request.experience_id),
-                "userId": current_user.id,
-            }
-        )
-
-        if not experience_doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Experience not found or access denied",
-            )
-
-        # Check if Stage 1 solution already exists
-        # Prevents duplicate processing and unnecessary AI API calls
-        # Each experience can only have one solution per stage
-        existing_solution = await db.solutions.find_one(
+        # Validate experience exists and belongs to user, and check whether a
+        # Stage 1 solution already exists. Ownership prevents unauthorized
+        # access to other users' experiences; the solution check prevents
+        # duplicate processing since each experience has one solution per stage.
+        # The lookups are independent, so both run concurrently and only fetch
+        # the fields used below. They are not merged into one $lookup
+        # aggregation: solutions store experienceId as a string, so the join
+        # would need $toString in $expr, and the ownership cache below lets
+        # repeat submissions skip the experience query altogether.
+        experience_oid = _parse_object_id(request.experience_id, "experience")
+        existing_solution_lookup = db.solutions.find_one(
             {
                 "experienceId": request.experience_id,
                 "stage": 1,
                 "userId": current_user.id,
-            }
+            },
+            projection={"status": 1, "metadata.confidence_score": 1},
         )
 
-        if (
-            existing_solution
-            and existing_solution.get("status") == SolutionStatus.COMPLETED
-        ):
-            return Stage1ProcessingResponse(
-                solution_id=str(existing_solution["_id"]),
-                status="already_exists",
-                stage=1,
-                processing_time=0.0,
-                confidence_score=existing_solution.get("metadata", {}).get(
-                    "confidence_score", 0.0
+        # Resubmits and retries re-validate the same experience, so a recent
+        # successful ownership check is reused instead of querying again
+        ownership_key = (current_user.id, request.experience_id)
+        experience_role = _experience_role_cache.get(ownership_key)
+        if experience_role is not None:
+            existing_solution = await existing_solution_lookup
+        else:
+            experience_doc, existing_solution = await asyncio.gather(
+                db.experiences.find_one(
+                    {"_id": experience_oid, "userId": current_user.id},
+                    projection={"role": 1},
                 ),
-                message="Stage 1 solution already exists for this experience",
+                existing_solution_lookup,
             )
 
-        # Create or update solution record
-        # This creates a database record to track processing status and store results
-        solution_id = None
+            if not experience_doc:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Experience not found or access denied",
+                )
+
+            experience_role = experience_doc["role"]
+            _experience_role_cache[ownership_key] = experience_role
+
+        # Completed or in-flight solutions are answered from the lookup above.
+        # The lookup overlaps the ownership check, so this costs no extra round
+        # trip; folding it into the claim below would instead need a pipeline
+        # update that persists a marker just to tell whether this request won.
         if existing_solution:
-            # Reprocess existing solution (e.g., after failure or user request)
-            solution_id = str(existing_solution["_id"])
-            # Update status to processing and record when processing started
-            await db.solutions.update_one(
-                {"_id": ObjectId(solution_id)},
+            existing_response = _existing_stage1_response(existing_solution)
+            if existing_response:
+                return existing_response
+
+        # Claim the solution for processing in one atomic upsert: a new record
+        # is created, or an existing one (e.g. after a failure) is moved back to
+        # PROCESSING. The status filter plus the unique user+experience+stage
+        # index mean only one of several concurrent submissions wins, so the
+        # AI call is never started twice for the same experience.
+        # One timestamp for every field written by this request
+        now = datetime.now(timezone.utc)
+        solution_filter = {
+            "userId": current_user.id,
+            "experienceId": request.experience_id,
+            "stage": 1,
+        }
+        try:
+            claimed_solution = await db.solutions.find_one_and_update(
+                {
+                    **solution_filter,
+                    "status": {
+                        "$nin": [SolutionStatus.COMPLETED, SolutionStatus.PROCESSING]
+                    },
+                },
                 {
                     "$set": {
                         "status": SolutionStatus.PROCESSING,
-                        "updatedAt": datetime.utcnow(),
-                        "processingStartedAt": datetime.utcnow(),
-                    }
+                        "updatedAt": now,
+                        "processingStartedAt": now,
+                    },
+                    # stageName helps identify the type of processing for analytics
+                    "$setOnInsert": {
+                        "stageName": "psychological_healing",
+                        "priority": request.priority,
+                        "createdAt": now,
+                    },
                 },
+                projection={"_id": 1},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
             )
-        else:
-            # Create new solution record with initial metadata
-            # stageName helps identify the type of processing for analytics
-            solution_doc = {
-                "userId": current_user.id,
-                "experienceId": request.experience_id,
-                "stage": 1,
-                "stageName": "psychological_healing",
-                "status": SolutionStatus.PROCESSING,
-                "priority": request.priority,
-                "createdAt": datetime.utcnow(),
-                "updatedAt": datetime.utcnow(),
-                "processingStartedAt": datetime.utcnow(),
-            }
+        except DuplicateKeyError:
+            # Another request created or claimed the solution after the lookup
+            existing_solution = await db.solutions.find_one(
+                solution_filter,
+                projection={"status": 1, "metadata.confidence_score": 1},
+            )
+            existing_response = existing_solution and _existing_stage1_response(
+                existing_solution
+            )
+            if not existing_response:
+                raise
+            return existing_response
 
-            result = await db.solutions.insert_one(solution_doc)
-            solution_id = result.inserted_id
+        solution_oid = claimed_solution["_id"]
 
         # Start background processing
         # Background task prevents blocking the API response while AI processes the experience
         # This improves user experience by allowing immediate response with status polling
+        # The ids are passed as ObjectIds, which the task queries with as is
         background_tasks.add_task(
             process_stage1_background,
-            str(solution_id),
-            str(request.experience_id),
-            experience_doc[
-                "role"
-            ],  # role affects AI prompt selection and response style
+            solution_oid,
+            experience_oid,
+            current_user.id,
+            experience_role,  # role affects AI prompt selection and response style
             request.additional_context
             or {},  # Additional context for personalized processing
         )
 
-        return Stage1ProcessingResponse(
-            solution_id=str(solution_id),
-            status="processing",
-            stage=1,
-            processing_time=0.0,
-            confidence_score=0.0,
-            message="Stage 1 processing started successfully",
-        )
+        return _STARTED_RESPONSE.model_copy(update={"solution_id": str(solution_oid)})
 
     except HTTPException:
         raise
@@ -236,7 +619,11 @@ async def process_stage1(
         )
 
 
-@router.get("/status/{solution_id}")
+# The status and result handlers return an ORJSONResponse built from the
+# payload dict, which FastAPI sends as is: the response models document the
+# shape in the OpenAPI schema without a per-call validation and
+# serialization pass through pydantic
+@router.get("/status/{solution_id}", response_model=Stage1StatusResponse)
 async def get_stage1_status(
     solution_id: str,
     current_user: User = Depends(get_current_user),
@@ -279,12 +666,10 @@ async def get_stage1_status(
         - "failed": Processing encountered an error, check error_message
     """
     try:
-        solution_doc = await db.solutions.find_one(
-            {
-                "_id": ObjectId(solution_id),
-                "userId": current_user.id,
-                "stage": 1,
-            }
+        # Many clients poll at the same cadence, so concurrent polls are
+        # answered by one batched query rather than a find_one each
+        solution_doc = await _load_stage1_status(
+            db, _parse_object_id(solution_id, "solution"), current_user.id
         )
 
         if not solution_doc:
@@ -293,35 +678,9 @@ async def get_stage1_status(
                 detail="Stage 1 solution not found",
             )
 
-        return {
-            "solution_id": str(solution_doc["_id"]),
-            "status": solution_doc["status"],
-            "stage": solution_doc["stage"],
-            "created_at": (
-                solution_doc["createdAt"].isoformat()
-                if solution_doc.get("createdAt")
-                else None
-            ),
-            "updated_at": (
-                solution_doc["updatedAt"].isoformat()
-                if solution_doc.get("updatedAt")
-                else None
-            ),
-            "processing_started_at": (
-                solution_doc.get("processingStartedAt").isoformat()
-                if solution_doc.get("processingStartedAt")
-                else None
-            ),
-            "completed_at": (
-                solution_doc.get("completedAt").isoformat()
-                if solution_doc.get("completedAt")
-                else None
-            ),
-            "confidence_score": solution_doc.get("metadata", {}).get(
-                "confidence_score", 0.0
-            ),
-            "error_message": solution_doc.get("errorMessage"),
-        }
+        # Returned as a response so FastAPI skips its jsonable_encoder pass
+        # and orjson serializes the datetimes directly
+        return ORJSONResponse(_stage1_status_payload(solution_doc))
 
     except HTTPException:
         raise
@@ -332,7 +691,70 @@ async def get_stage1_status(
         )
 
 
-@router.get("/result/{solution_id}")
+@router.get("/stream/{solution_id}")
+async def stream_stage1_status(
+    solution_id: str,
+    current_user: User = Depends(get_current_user),
+    db=Depends(get_database),
+):
+    """
+    Stream Stage 1 status changes as Server-Sent Events.
+
+    Push-based alternative to polling the status endpoint. The current status
+    is sent immediately, then again whenever the background job completes or
+    fails, and the stream closes once a final status has been sent. Each event
+    carries the same payload as the status endpoint.
+
+    Args:
+        solution_id (str): MongoDB ObjectId of the solution to watch
+        current_user (User): Authenticated user from JWT token
+        db: MongoDB database connection
+
+    Returns:
+        StreamingResponse: text/event-stream of status payloads
+
+    Raises:
+        HTTPException: 404 if solution not found or access denied
+        HTTPException: 500 for database errors
+
+    Example Event:
+        data: {"solution_id": "507f1f77bcf86cd799439011", "status": "completed", ...}
+    """
+    solution_oid = _parse_object_id(solution_id, "solution")
+
+    # Subscribe before reading the current status so a job finishing in
+    # between still wakes this stream
+    # (keyed by the normalised id, which is what the background job reports)
+    listener_key = str(solution_oid)
+    queue = _subscribe(listener_key)
+
+    try:
+        solution_doc = await _load_stage1_status(db, solution_oid, current_user.id)
+
+        if not solution_doc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Stage 1 solution not found",
+            )
+
+    except HTTPException:
+        _unsubscribe(listener_key, queue)
+        raise
+    except Exception as e:
+        _unsubscribe(listener_key, queue)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get Stage 1 status: {str(e)}",
+        )
+
+    return StreamingResponse(
+        _stage1_event_stream(db, solution_oid, current_user.id, queue, solution_doc),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/result/{solution_id}", response_model=Stage1ResultResponse)
 async def get_stage1_result(
     solution_id: str,
     current_user: User = Depends(get_current_user),
@@ -388,12 +810,22 @@ async def get_stage1_result(
         - User can only access their own solutions
     """
     try:
+        solution_oid = _parse_object_id(solution_id, "solution")
+
+        # Completed results don't change until regenerated, so repeat fetches
+        # are served without another query or decryption pass
+        result_key = str(solution_oid)
+        cached_result = _result_cache.get(result_key)
+        if cached_result and cached_result[0] == current_user.id:
+            return ORJSONResponse(cached_result[1])
+
         solution_doc = await db.solutions.find_one(
             {
-                "_id": ObjectId(solution_id),
+                "_id": solution_oid,
                 "userId": current_user.id,
                 "stage": 1,
-            }
+            },
+            projection=_RESULT_PROJECTION,
         )
 
         if not solution_doc:
@@ -410,7 +842,12 @@ async def get_stage1_result(
 
         # Decrypt the solution content using field-level decryption
         # All sensitive AI-generated content is encrypted at rest for security
-        decrypted_solution = decrypt_solution_data(dict(solution_doc))
+        # Decryption is CPU-bound, so it runs in a worker thread to keep the
+        # event loop free for other requests. The document was just loaded for
+        # this request, so it is decrypted in place rather than deep-copied.
+        decrypted_solution = await asyncio.to_thread(
+            decrypt_solution_data_inplace, solution_doc
+        )
 
         # Extract the decrypted content
         content = decrypted_solution.get("content", {})
@@ -427,7 +864,7 @@ async def get_stage1_result(
             "resources": content.get("resources", []),  # Resources are not encrypted
         }
 
-        return {
+        result = {
             "solution_id": str(solution_doc["_id"]),
             "stage": decrypted_solution["stage"],
             "stage_name": decrypted_solution["stageName"],
@@ -448,13 +885,11 @@ async def get_stage1_result(
             "aiMetadata": decrypted_solution.get(
                 "aiMetadata", {}
             ),  # Include AI metadata
-            "created_at": decrypted_solution["createdAt"].isoformat(),
-            "completed_at": (
-                decrypted_solution.get("completedAt").isoformat()
-                if decrypted_solution.get("completedAt")
-                else None
-            ),
+            "created_at": decrypted_solution["createdAt"],
+            "completed_at": decrypted_solution.get("completedAt"),
         }
+        _result_cache[result_key] = (current_user.id, result)
+        return ORJSONResponse(result)
 
     except HTTPException:
         raise
@@ -511,12 +946,27 @@ async def regenerate_stage1_solution(
         - Feedback influences AI prompt selection and response generation
     """
     try:
-        solution_doc = await db.solutions.find_one(
+        # Look up the solution and mark it as processing in one round trip
+        # Track regeneration attempts to prevent abuse and for analytics
+        # Store user feedback to improve future AI responses
+        # $inc also keeps the regeneration count exact under concurrent requests
+        now = datetime.now(timezone.utc)
+        solution_doc = await db.solutions.find_one_and_update(
             {
-                "_id": ObjectId(solution_id),
+                "_id": _parse_object_id(solution_id, "solution"),
                 "userId": current_user.id,
                 "stage": 1,
-            }
+            },
+            {
+                "$set": {
+                    "status": SolutionStatus.PROCESSING,
+                    "updatedAt": now,
+                    "processingStartedAt": now,
+                    "lastFeedback": feedback,  # Used by AI service to improve response
+                },
+                "$inc": {"regenerationCount": 1},
+            },
+            projection={"experienceId": 1},
         )
 
         if not solution_doc:
@@ -525,28 +975,18 @@ async def regenerate_stage1_solution(
                 detail="Stage 1 solution not found",
             )
 
-        # Update solution status to processing
-        # Track regeneration attempts to prevent abuse and for analytics
-        # Store user feedback to improve future AI responses
-        await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
-            {
-                "$set": {
-                    "status": SolutionStatus.PROCESSING,
-                    "updatedAt": datetime.utcnow(),
-                    "regenerationCount": solution_doc.get("regenerationCount", 0) + 1,
-                    "lastFeedback": feedback,  # Used by AI service to improve response
-                }
-            },
-        )
+        # The cached result is about to be replaced
+        _result_cache.pop(str(solution_doc["_id"]), None)
 
         # Start background regeneration
         # Regeneration uses the same background task but with additional context
         # The "regeneration" flag tells the AI service to consider previous attempts
         background_tasks.add_task(
             process_stage1_background,
-            solution_id,
-            str(solution_doc["experienceId"]),
+            solution_doc["_id"],
+            # Solutions store experienceId as a string
+            ObjectId(solution_doc["experienceId"]),
+            current_user.id,
             current_user.role,
             {
                 "regeneration": True,
@@ -570,8 +1010,9 @@ async def regenerate_stage1_solution(
 
 
 async def process_stage1_background(
-    solution_id: str,
-    experience_id: str,
+    solution_oid: ObjectId,
+    experience_oid: ObjectId,
+    user_id: str,
     user_role: str,
     additional_context: Dict[str, Any],
 ):
@@ -583,55 +1024,64 @@ async def process_stage1_background(
     the complete processing pipeline from data preparation to result storage.
 
     Args:
-        solution_id (str): MongoDB ObjectId of the solution record to update
-        experience_id (str): MongoDB ObjectId of the experience to process
+        solution_oid (ObjectId): ID of the solution record to update
+        experience_oid (ObjectId): ID of the experience to process
+        user_id (str): ID of the user who owns the experience
         user_role (str): User's role for personalized AI responses
         additional_context (Dict[str, Any]): Extra context including feedback and preferences
 
     Processing Steps:
-        1. Establishes database connection for background task
-        2. Retrieves experience data and associated media files
+        1. Uses the application's shared database connection pool
+        2. Retrieves experience data and associated media files concurrently
         3. Prepares data structure for AI service consumption
-        4. Calls enhanced AI service for Stage 1 processing
+        4. Reuses a cached response for identical input, otherwise calls the
+           enhanced AI service for Stage 1 processing
         5. Updates solution record with encrypted results
         6. Handles errors by updating solution status appropriately
 
     Error Handling:
         - Database connection errors are logged and solution marked as failed
         - AI processing errors are captured and stored in solution record
+        - AI calls running past AI_PROCESSING_TIMEOUT_SECONDS fail the solution
         - All exceptions are logged for debugging and monitoring
-        - Database connection is always closed in finally block
 
     Security Considerations:
-        - Creates isolated database connection for background processing
+        - Shares the application's connection pool, which close_db releases on shutdown
         - AI-generated content is encrypted before database storage
         - User data access is validated through experience ownership
     """
-    from motor.motor_asyncio import AsyncIOMotorClient
-
-    from ..core.config import settings
-
-    # Create database connection for background task
-    # Background tasks need their own database connection since they run outside request context
-    client = AsyncIOMotorClient(settings.MONGO_URI)
-    db = client[settings.MONGO_DB]
+    # Background tasks run after the response is sent, outside the request's
+    # dependency scope, so the database is fetched directly. PyMongo's client
+    # pools connections and is safe to share across tasks, which avoids a
+    # fresh connect/TLS/auth handshake for every job.
+    db = get_database()
+    # String form for the in-process caches, status listeners and logs
+    solution_id = str(solution_oid)
 
     try:
-        # Get experience data
+        # Get experience data and the media files attached to it
         # Experience contains the user's input that needs AI analysis
-        experience_doc = await db.experiences.find_one({"_id": ObjectId(experience_id)})
-        if not experience_doc:
-            raise Exception("Experience not found")
-
-        # Get media files associated with this experience
         # Media files (images, audio, video) provide additional context for AI processing
         # Limited to 50 files to prevent memory issues and excessive processing time
-        media_files = await db.media_files.find(
-            {
-                "userId": experience_doc["userId"],
-                "experienceId": ObjectId(experience_id),
-            }
-        ).to_list(length=50)
+        # Only the descriptive fields are loaded; the processing metadata
+        # (transcripts, extracted text) can be large and isn't used here
+        # The owner's id comes from the endpoint (which verified ownership),
+        # so the media query doesn't wait on the experience and both reads
+        # run concurrently, saving a round trip before the AI call
+        experience_doc, media_files = await asyncio.gather(
+            db.experiences.find_one(
+                {"_id": experience_oid, "userId": user_id},
+                projection=_BACKGROUND_EXPERIENCE_PROJECTION,
+            ),
+            db.media_files.find(
+                {"userId": user_id, "experienceId": experience_oid},
+                projection=_MEDIA_PROJECTION,
+            )
+            .limit(50)
+            .to_list(length=50),
+        )
+        if not experience_doc:
+            raise Exception("Experience not found")
 
         # Prepare experience data for AI processing
         # Structure data in format expected by AI service
@@ -644,50 +1094,159 @@ async def process_stage1_background(
             "additional_context": additional_context,  # Feedback, preferences, regeneration flags
         }
 
-        # Process with enhanced AI service
-        # Stage 1 focuses on psychological healing and emotional support
-        # User role influences prompt selection and response style (student, professional, etc.)
-        result = await enhanced_ai_service.process_experience_stage1(
-            experience_data, user_role
-        )
+        # Identical input produces an equivalent solution, so completed AI
+        # responses are cached by a hash of the request. Regeneration asks for
+        # a different answer on purpose and always goes to the AI service.
+        use_cache = not additional_context.get("regeneration")
+        cache_key = None
+        cached = None
+        if use_cache:
+            cache_key = _stage1_cache_key(
+                experience_data["data"], user_role, additional_context, media_files
+            )
+            cached = await db.ai_cache.find_one({"_id": cache_key})
 
-        # Update solution with results
-        solution_data = {
-            "status": SolutionStatus.COMPLETED,
-            "content": result["content"],  # AI-generated content
-            "aiMetadata": result.get(
-                "metadata", {}
-            ),  # Processing stats and confidence scores
-            "completedAt": datetime.utcnow(),
-            "updatedAt": datetime.utcnow(),
-        }
+        if cached:
+            # Cached fields are already encrypted, reuse them as stored
+            encrypted_solution_data = {
+                field: cached[field] for field in _AI_CACHE_FIELDS if field in cached
+            }
+            now = datetime.now(timezone.utc)
+            encrypted_solution_data["status"] = SolutionStatus.COMPLETED
+            encrypted_solution_data["completedAt"] = now
+            encrypted_solution_data["updatedAt"] = now
+        else:
+            # Process with enhanced AI service
+            # Stage 1 focuses on psychological healing and emotional support
+            # User role influences prompt selection and response style (student, professional, etc.)
+            # Bounded so a hung AI call fails the job instead of leaving it in
+            # PROCESSING, which would also block resubmitting the experience
+            result = await asyncio.wait_for(
+                enhanced_ai_service.process_experience_stage1(
+                    experience_data, user_role
+                ),
+                timeout=settings.AI_PROCESSING_TIMEOUT_SECONDS,
+            )
 
-        # Apply field-level encryption
-        encrypted_solution_data = encrypt_solution_data(solution_data)
+            # Update solution with results, timestamped once the AI call returns
+            now = datetime.now(timezone.utc)
+            solution_data = {
+                "status": SolutionStatus.COMPLETED,
+                "content": result["content"],  # AI-generated content
+                "aiMetadata": result.get(
+                    "metadata", {}
+                ),  # Processing stats and confidence scores
+                "completedAt": now,
+                "updatedAt": now,
+            }
 
-        await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
-            {"$set": encrypted_solution_data},
-        )
+            # Apply field-level encryption off the event loop (CPU-bound).
+            # solution_data exists only to be stored, so it is encrypted in
+            # place; fields outside the schema such as resources are left as
+            # they are rather than deep-copied.
+            encrypted_solution_data = await asyncio.to_thread(
+                encrypt_solution_data_inplace, solution_data
+            )
+
+        writes = [
+            db.solutions.update_one(
+                {"_id": solution_oid},
+                {"$set": encrypted_solution_data},
+            )
+        ]
+        if use_cache and not cached:
+            # Only the encrypted form is cached so AI output never sits in
+            # the database as plaintext. A concurrent job for the same input
+            # may have cached it first, which is fine to ignore. The write is
+            # not acknowledged: a lost entry only costs a later cache miss,
+            # and the job doesn't wait on it before reporting completion.
+            cache_doc = {
+                field: encrypted_solution_data[field]
+                for field in _AI_CACHE_FIELDS
+                if field in encrypted_solution_data
+            }
+            cache_doc["createdAt"] = now
+            writes.append(
+                db.ai_cache.with_options(
+                    write_concern=_AI_CACHE_WRITE_CONCERN
+                ).update_one(
+                    {"_id": cache_key}, {"$setOnInsert": cache_doc}, upsert=True
+                )
+            )
+
+        # The solution and cache writes go to different collections and don't
+        # depend on each other, so they share a single round trip
+        await asyncio.gather(*writes)
+        _result_cache.pop(solution_id, None)
+        _notify_status_change(solution_id)
 
     except Exception as e:
         # Update solution with error status
         # Error handling ensures user gets feedback about processing failures
         # Error messages are stored for debugging and user support
         await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
+            {"_id": solution_oid},
             {
                 "$set": {
                     "status": SolutionStatus.FAILED,
-                    "errorMessage": str(e),  # Error details for debugging
-                    "updatedAt": datetime.utcnow(),
+                    # Error details for debugging
+                    "errorMessage": (
+                        "Stage 1 AI processing timed out"
+                        if isinstance(e, asyncio.TimeoutError)
+                        else str(e)
+                    ),
+                    "updatedAt": datetime.now(timezone.utc),
                 }
             },
         )
-        # Log error for monitoring and debugging
-        print(f"Stage 1 processing failed for solution {solution_id}: {e}")
+        _result_cache.pop(solution_id, None)
+        _notify_status_change(solution_id)
+        # Log error for monitoring and debugging; the traceback is kept
+        logger.exception(
+            "Stage 1 processing failed for solution %s",
+            solution_id,
+            extra={"solution_id": solution_id},
+        )
 
-    finally:
-        # Always close database connection to prevent connection leaks
-        # Critical for background tasks that create their own connections
-        client.close()
+
+async def fail_interrupted_stage1_jobs() -> int:
+    """
+    Mark Stage 1 jobs orphaned by a process restart as failed.
+
+    Background jobs run inside the API process, so a restart or crash drops
+    any job in flight and leaves its solution in PROCESSING. Since a
+    PROCESSING solution cannot be resubmitted, such records would block the
+    experience forever. Called on startup, this fails every Stage 1 solution
+    that has been processing for longer than a job is allowed to run, so the
+    user can submit it again.
+
+    Jobs still running in other workers are untouched: anything older than
+    the cutoff would already have hit the AI timeout there.
+
+    Returns:
+        int: Number of solutions marked as failed
+    """
+    db = get_database()
+    now = datetime.now(timezone.utc)
+    # Allow for the writes and encryption that follow the AI call
+    cutoff = now - timedelta(seconds=settings.AI_PROCESSING_TIMEOUT_SECONDS + 60)
+
+    result = await db.solutions.update_many(
+        {
+            "stage": 1,
+            "status": SolutionStatus.PROCESSING,
+            "processingStartedAt": {"$lt": cutoff},
+        },
+        {
+            "$set": {
+                "status": SolutionStatus.FAILED,
+                "errorMessage": "Stage 1 processing was interrupted, please retry",
+                "updatedAt": now,
+            }
+        },
+    )
+    if result.modified_count:
+        logger.warning(
+            "Marked %d interrupted Stage 1 jobs as failed", result.modified_count
+        )
+    return result.modified_count
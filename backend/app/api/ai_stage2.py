@@ -2,21 +2,90 @@
 API endpoints for Stage 2 AI processing - Practical solution generation.
 """
 
-from datetime import datetime
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from bson import ObjectId
+from cachetools import TTLCache
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
+from ..core.config import settings
 from ..core.database import get_database
 from ..dependencies import get_current_user
 from ..models.solution import SolutionStatus
 from ..models.user import User
 from ..services.enhanced_ai_service import enhanced_ai_service
-from ..utils.field_encryption import decrypt_solution_data, encrypt_solution_data
+from ..utils.field_encryption import (
+    decrypt_solution_status_inplace,
+    encrypt_solution_data,
+)
+
+logger = logging.getLogger(__name__)
+
+# orjson serializes the responses, including the decrypted content and
+# datetimes, much faster than the stdlib json path
+router = APIRouter(
+    prefix="/api/ai/stage2",
+    tags=["ai-stage2"],
+    default_response_class=ORJSONResponse,
+)
+
+# Fields the status endpoint returns. aiMetadata and user feedback are
+# encrypted too but never returned here, so they are neither loaded nor
+# decrypted.
+_STATUS_PROJECTION = {
+    "status": 1,
+    "stage": 1,
+    "content": 1,
+    "processingTime": 1,
+    "metadata.confidence_score": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "stage1SolutionId": 1,
+    "_encryption": 1,  # Needed by decrypt_solution_status_inplace
+}
+
+# Fields the background job passes to the AI service: the experience's form
+# data, media content and role (plus its owner for the completion cache), and
+# the Stage 1 content and metadata its practical steps build on
+_BACKGROUND_EXPERIENCE_PROJECTION = {
+    "data": 1,
+    "content": 1,
+    "role": 1,
+    "userId": 1,
+}
+_STAGE1_CONTEXT_PROJECTION = {"content": 1, "metadata": 1}
+
+# (userId, experienceId) -> (solution id, confidence score) for completed
+# Stage 2 solutions. A completed solution is never reprocessed, so repeat
+# submissions are answered without touching the database; the TTL bounds how
+# long one is still reported after its experience or solution is deleted.
+_completed_solutions: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def _parse_object_id(value: str, name: str) -> ObjectId:
+    """Convert a client-supplied id to an ObjectId, rejecting malformed ids with 400.
+
+    ObjectId.is_valid checks the format without raising, so bad ids are
+    turned away before any database call instead of surfacing as a 500.
+    """
+    if not ObjectId.is_valid(value):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} ID"
+        )
+    return ObjectId(value)
 
-router = APIRouter(prefix="/api/ai/stage2", tags=["ai-stage2"])
+
+async def _no_document() -> None:
+    """Stand-in for an optional lookup that is skipped in asyncio.gather."""
+    return None
 
 
 class Stage2ProcessingRequest(BaseModel):
@@ -35,6 +104,62 @@ class Stage2ProcessingResponse(BaseModel):
     message: str
 
 
+def _already_exists_response(
+    solution_id: str, confidence_score: float
+) -> Stage2ProcessingResponse:
+    """Response for a submission whose Stage 2 solution is already completed."""
+    return Stage2ProcessingResponse(
+        solution_id=solution_id,
+        status="already_exists",
+        stage=2,
+        processing_time=0.0,
+        confidence_score=confidence_score,
+        message="Stage 2 solution already exists for this experience",
+    )
+
+
+def _completed_response(
+    user_id: str, experience_id: str, solution: Dict[str, Any]
+) -> Stage2ProcessingResponse:
+    """Cache a completed Stage 2 solution and report it as already existing."""
+    completed = (
+        str(solution["_id"]),
+        solution.get("metadata", {}).get("confidence_score", 0.0),
+    )
+    _completed_solutions[(user_id, experience_id)] = completed
+    return _already_exists_response(*completed)
+
+
+async def _unclaimed_response(
+    db, solution_filter: Dict[str, Any]
+) -> Stage2ProcessingResponse:
+    """Report a Stage 2 solution the submission couldn't claim.
+
+    Another request holds a live claim on it and has queued its processing,
+    or it completed after the submission first read it.
+    """
+    existing_solution = await db.solutions.find_one(
+        solution_filter,
+        projection={"status": 1, "metadata.confidence_score": 1},
+    )
+    if not existing_solution:
+        raise RuntimeError("Stage 2 solution was removed while claiming it")
+    if existing_solution.get("status") == SolutionStatus.COMPLETED:
+        return _completed_response(
+            solution_filter["userId"],
+            solution_filter["experienceId"],
+            existing_solution,
+        )
+    return Stage2ProcessingResponse(
+        solution_id=str(existing_solution["_id"]),
+        status="processing",
+        stage=2,
+        processing_time=0.0,
+        confidence_score=0.0,
+        message="Stage 2 processing already in progress",
+    )
+
+
 @router.post("/process", response_model=Stage2ProcessingResponse)
 async def process_stage2(
     request: Stage2ProcessingRequest,
@@ -49,12 +174,53 @@ async def process_stage2(
     actionable solutions and recommendations.
     """
     try:
-        # Validate experience exists and belongs to user
-        experience_doc = await db.experiences.find_one(
-            {
-                "_id": ObjectId(request.experience_id),
-                "userId": current_user.id,
-            }
+        # Completed solutions seen recently by this process need no queries
+        completed = _completed_solutions.get((current_user.id, request.experience_id))
+        if completed:
+            return _already_exists_response(*completed)
+
+        # Malformed ids are rejected with 400 before any query
+        experience_oid = _parse_object_id(request.experience_id, "experience")
+        stage1_solution_oid = (
+            _parse_object_id(request.stage1_solution_id, "Stage 1 solution")
+            if request.stage1_solution_id
+            else None
+        )
+
+        solution_filter = {
+            "userId": current_user.id,
+            "experienceId": request.experience_id,
+            "stage": 2,
+        }
+
+        # Validate experience exists and belongs to user, check that a
+        # referenced Stage 1 solution exists and belongs to them too, and
+        # look up any Stage 2 solution already recorded for the experience.
+        # The reads are independent, so they run concurrently.
+        experience_doc, stage1_solution, existing_solution = await asyncio.gather(
+            db.experiences.find_one(
+                {
+                    "_id": experience_oid,
+                    "userId": current_user.id,
+                },
+                projection={"role": 1},
+            ),
+            (
+                db.solutions.find_one(
+                    {
+                        "_id": stage1_solution_oid,
+                        "userId": current_user.id,
+                        "stage": 1,
+                    },
+                    projection={"_id": 1},
+                )
+                if stage1_solution_oid
+                else _no_document()
+            ),
+            db.solutions.find_one(
+                solution_filter,
+                projection={"status": 1, "metadata.confidence_score": 1},
+            ),
         )
 
         if not experience_doc:
@@ -63,75 +229,83 @@ async def process_stage2(
                 detail="Experience not found or access denied",
             )
 
-        # Check if Stage 2 solution already exists
-        existing_solution = await db.solutions.find_one(
-            {
-                "experienceId": request.experience_id,
-                "stage": 2,
-                "userId": current_user.id,
-            }
-        )
+        # The background job would silently run without a context that
+        # doesn't exist, so a bad reference is reported instead
+        if stage1_solution_oid and not stage1_solution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Stage 1 solution not found",
+            )
 
+        # A completed solution is never reprocessed
         if (
             existing_solution
             and existing_solution.get("status") == SolutionStatus.COMPLETED
         ):
-            return Stage2ProcessingResponse(
-                solution_id=str(existing_solution["_id"]),
-                status="already_exists",
-                stage=2,
-                processing_time=0.0,
-                confidence_score=existing_solution.get("metadata", {}).get(
-                    "confidence_score", 0.0
-                ),
-                message="Stage 2 solution already exists for this experience",
+            return _completed_response(
+                current_user.id, request.experience_id, existing_solution
             )
 
-        # Optionally get Stage 1 solution for context
-        stage1_solution = None
-        if request.stage1_solution_id:
-            stage1_solution = await db.solutions.find_one(
+        # Create the solution record, or move an existing unfinished one back
+        # to PROCESSING, in one atomic update. The claim lives in the
+        # database so it holds across worker processes: a completed solution,
+        # or one a job started within the AI timeout is still processing,
+        # doesn't match. Older claims belong to a job that died with its
+        # worker and are taken over. Only a missing solution is upserted, so
+        # a miss never inserts a duplicate; two requests creating it at once
+        # collide on the unique user+experience+stage index.
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(
+            seconds=settings.AI_PROCESSING_TIMEOUT_SECONDS + 60
+        )
+        try:
+            solution_doc = await db.solutions.find_one_and_update(
                 {
-                    "_id": ObjectId(request.stage1_solution_id),
-                    "userId": current_user.id,
-                    "stage": 1,
-                }
-            )
-
-        # Create or update solution record
-        solution_id = None
-        if existing_solution:
-            solution_id = str(existing_solution["_id"])
-            # Update status to processing
-            await db.solutions.update_one(
-                {"_id": ObjectId(solution_id)},
+                    **solution_filter,
+                    "$or": [
+                        {
+                            "status": {
+                                "$nin": [
+                                    SolutionStatus.COMPLETED,
+                                    SolutionStatus.PROCESSING,
+                                ]
+                            }
+                        },
+                        {
+                            "status": SolutionStatus.PROCESSING,
+                            "processingStartedAt": {"$not": {"$gte": stale_before}},
+                        },
+                    ],
+                },
                 {
                     "$set": {
                         "status": SolutionStatus.PROCESSING,
-                        "updatedAt": datetime.utcnow(),
-                        "processingStartedAt": datetime.utcnow(),
-                    }
+                        "updatedAt": now,
+                        "processingStartedAt": now,
+                    },
+                    "$setOnInsert": {
+                        "stageName": "practical_solutions",
+                        "priority": request.priority,
+                        "stage1SolutionId": (
+                            request.stage1_solution_id
+                            if request.stage1_solution_id
+                            else None
+                        ),
+                        "createdAt": now,
+                    },
                 },
+                projection={"_id": 1},
+                upsert=existing_solution is None,
+                return_document=ReturnDocument.AFTER,
             )
-        else:
-            # Create new solution record
-            solution_doc = {
-                "userId": current_user.id,
-                "experienceId": request.experience_id,
-                "stage": 2,
-                "stageName": "practical_solutions",
-                "status": SolutionStatus.PROCESSING,
-                "priority": request.priority,
-                "stage1SolutionId": (
-                    request.stage1_solution_id if request.stage1_solution_id else None
-                ),
-                "createdAt": datetime.utcnow(),
-                "updatedAt": datetime.utcnow(),
-                "processingStartedAt": datetime.utcnow(),
-            }
+        except DuplicateKeyError:
+            # A concurrent request created the solution first
+            solution_doc = None
+
+        if not solution_doc:
+            return await _unclaimed_response(db, solution_filter)
 
-            result = await db.solutions.insert_one(solution_doc)
-            solution_id = result.inserted_id
+        solution_id = solution_doc["_id"]
 
         # Start background processing
         background_tasks.add_task(
@@ -171,10 +345,11 @@ async def get_stage2_status(
     try:
         solution_doc = await db.solutions.find_one(
             {
-                "_id": ObjectId(solution_id),
+                "_id": _parse_object_id(solution_id, "solution"),
                 "userId": current_user.id,
                 "stage": 2,
-            }
+            },
+            projection=_STATUS_PROJECTION,
         )
 
         if not solution_doc:
@@ -184,34 +359,45 @@ async def get_stage2_status(
             )
 
         # Decrypt solution data using field-level decryption
+        # Only the content fields are loaded, so just those are decrypted, in
+        # one pass over the freshly loaded document (no copy) on a worker
+        # thread to keep the CPU-bound work off the event loop
         decrypted_solution = solution_doc
         if solution_doc.get("status") == SolutionStatus.COMPLETED:
             try:
-                decrypted_solution = decrypt_solution_data(dict(solution_doc))
+                decrypted_solution = await asyncio.to_thread(
+                    decrypt_solution_status_inplace, solution_doc
+                )
             except Exception as e:
-                print(f"Decryption warning: {e}")
+                logger.warning(
+                    "Failed to decrypt Stage 2 solution %s: %s", solution_id, e
+                )
                 # Fall back to original data if decryption fails
                 decrypted_solution = solution_doc
 
         content = decrypted_solution.get("content", {})
 
-        return {
-            "solution_id": str(solution_doc["_id"]),
-            "status": solution_doc.get("status", SolutionStatus.PROCESSING),
-            "stage": solution_doc.get("stage", 2),
-            "content": content,
-            "processing_time": solution_doc.get("processingTime", 0.0),
-            "confidence_score": solution_doc.get("metadata", {}).get(
-                "confidence_score", 0.0
-            ),
-            "created_at": solution_doc.get("createdAt"),
-            "updated_at": solution_doc.get("updatedAt"),
-            "stage1_solution_id": (
-                str(solution_doc["stage1SolutionId"])
-                if solution_doc.get("stage1SolutionId")
-                else None
-            ),
-        }
+        # Returned as a response so FastAPI skips its jsonable_encoder pass
+        # and orjson serializes the content and datetimes directly
+        return ORJSONResponse(
+            {
+                "solution_id": str(solution_doc["_id"]),
+                "status": solution_doc.get("status", SolutionStatus.PROCESSING),
+                "stage": solution_doc.get("stage", 2),
+                "content": content,
+                "processing_time": solution_doc.get("processingTime", 0.0),
+                "confidence_score": solution_doc.get("metadata", {}).get(
+                    "confidence_score", 0.0
+                ),
+                "created_at": solution_doc.get("createdAt"),
+                "updated_at": solution_doc.get("updatedAt"),
+                "stage1_solution_id": (
+                    str(solution_doc["stage1SolutionId"])
+                    if solution_doc.get("stage1SolutionId")
+                    else None
+                ),
+            }
+        )
 
     except HTTPException:
         raise
@@ -244,8 +430,8 @@ async def process_stage2_background(
         additional_context (Dict[str, Any]): Extra context and preferences
 
     Processing Flow:
-        1. Establishes database connection for background processing
-        2. Retrieves experience data and optional Stage 1 solution
+        1. Uses the application's shared database connection pool
+        2. Retrieves experience data and optional Stage 1 solution concurrently
         3. Calls enhanced AI service for Stage 2 practical solution generation
         4. Calculates processing time and performance metrics
         5. Updates solution record with encrypted results and metadata
@@ -261,6 +447,7 @@ async def process_stage2_background(
     Error Handling:
         - Database connection errors are logged and solution marked as failed
         - AI processing errors are captured and stored in solution record
+        - AI calls running past AI_PROCESSING_TIMEOUT_SECONDS fail the solution
         - Processing time is tracked even for failed attempts
         - Solution status is updated to GENERATED (retry-able) on failure
 
@@ -271,40 +458,56 @@ async def process_stage2_background(
         - Context provision tracking for analytics
     """
     # Track processing time for performance monitoring and user feedback
-    start_time = datetime.utcnow()
+    # A monotonic clock isn't affected by system clock adjustments mid-job
+    start_time = time.monotonic()
+    # Background tasks run outside the request's dependency scope, so the
+    # shared pooled client is fetched directly; the error path reuses it
+    db = get_database()
+    # Parsed once; the success and error writes both target this solution
+    solution_oid = ObjectId(solution_id)
 
     try:
-        # Get database connection for background task processing
-        db = get_database()
-
         # Get experience data containing user's original input
         # This provides the context for practical solution generation
-        experience_doc = await db.experiences.find_one({"_id": ObjectId(experience_id)})
+        # Get Stage 1 solution if available for context integration
+        # Stage 1 provides emotional healing context that Stage 2 builds upon
+        # Both reads are independent and run concurrently
+        experience_doc, stage1_solution_doc = await asyncio.gather(
+            db.experiences.find_one(
+                {"_id": ObjectId(experience_id)},
+                projection=_BACKGROUND_EXPERIENCE_PROJECTION,
+            ),
+            (
+                db.solutions.find_one(
+                    {"_id": ObjectId(stage1_solution_id)},
+                    projection=_STAGE1_CONTEXT_PROJECTION,
+                )
+                if stage1_solution_id
+                else _no_document()
+            ),
+        )
 
         if not experience_doc:
             raise Exception("Experience not found")
 
-        # Get Stage 1 solution if available for context integration
-        # Stage 1 provides emotional healing context that Stage 2 builds upon
-        stage1_solution_doc = None
-        if stage1_solution_id:
-            stage1_solution_doc = await db.solutions.find_one(
-                {"_id": ObjectId(stage1_solution_id)}
-            )
-
         # Process with enhanced AI service for Stage 2 practical solutions
         # This generates actionable steps, strategies, and resource recommendations
-        processing_result = await enhanced_ai_service.process_experience_stage2(
-            experience_data=experience_doc,  # Original user experience
-            stage1_solution=stage1_solution_doc,  # Optional emotional healing context
-            user_role=experience_doc[
-                "role"
-            ],  # Personalizes solutions for role-specific needs
-            additional_context=additional_context,  # User preferences and feedback
+        # The job runs in the API process, so a hung AI call is cut off rather
+        # than holding its connection and memory indefinitely
+        processing_result = await asyncio.wait_for(
+            enhanced_ai_service.process_experience_stage2(
+                experience_data=experience_doc,  # Original user experience
+                stage1_solution=stage1_solution_doc,  # Optional emotional healing context
+                user_role=experience_doc[
+                    "role"
+                ],  # Personalizes solutions for role-specific needs
+                additional_context=additional_context,  # User preferences and feedback
+            ),
+            timeout=settings.AI_PROCESSING_TIMEOUT_SECONDS,
         )
 
         # Calculate total processing time including AI API calls and data processing
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
+        processing_time = time.monotonic() - start_time
 
         solution_data = {
             "status": SolutionStatus.COMPLETED,  # Mark as successfully completed
@@ -319,42 +522,59 @@ async def process_stage2_background(
                 "context_provided": bool(additional_context),  # Had additional context
             },
             "processingTime": processing_time,  # Duplicate for compatibility
-            "updatedAt": datetime.utcnow(),  # Last update timestamp
-            "completedAt": datetime.utcnow(),  # Completion timestamp
         }
 
         # Apply field-level encryption
         encrypted_solution_data = encrypt_solution_data(solution_data)
 
+        # updatedAt/completedAt are stamped by the server in the same write
         await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
-            {"$set": encrypted_solution_data},
+            {"_id": solution_oid},
+            {
+                "$set": encrypted_solution_data,
+                "$currentDate": {"updatedAt": True, "completedAt": True},
+            },
+        )
+        _completed_solutions[(experience_doc["userId"], experience_id)] = (
+            solution_id,
+            solution_data["metadata"]["confidence_score"],
         )
 
         # Log successful completion for monitoring and debugging
-        print(f"✅ Stage 2 processing completed for solution {solution_id}")
+        logger.info("Stage 2 processing completed for solution %s", solution_id)
 
     except Exception as e:
         # Log processing failure with details for debugging
-        print(f"❌ Stage 2 processing failed for solution {solution_id}: {e}")
+        logger.exception(
+            "Stage 2 processing failed for solution %s",
+            solution_id,
+            extra={"solution_id": solution_id},
+        )
 
         # Update solution with error status and details
         # Status is set to GENERATED (not FAILED) to allow retry attempts
         try:
-            db = get_database()
             await db.solutions.update_one(
-                {"_id": ObjectId(solution_id)},
+                {"_id": solution_oid},
                 {
                     "$set": {
                         "status": SolutionStatus.GENERATED,  # Retry-able status
-                        "error": str(e),  # Error details for debugging
-                        "updatedAt": datetime.utcnow(),  # Update timestamp
-                        "processingTime": (
-                            datetime.utcnow() - start_time
-                        ).total_seconds(),  # Time spent before failure
-                    }
+                        # Error details for debugging
+                        "error": (
+                            "Stage 2 AI processing timed out"
+                            if isinstance(e, asyncio.TimeoutError)
+                            else str(e)
+                        ),
+                        # Time spent before failure
+                        "processingTime": time.monotonic() - start_time,
+                    },
+                    "$currentDate": {"updatedAt": True},  # Update timestamp
                 },
             )
         except Exception as db_error:
             # Log database update failures for system monitoring
-            print(f"Failed to update solution error status: {db_error}")
+            logger.error(
+                "Failed to update error status for Stage 2 solution %s: %s",
+                solution_id,
+                db_error,
+            )
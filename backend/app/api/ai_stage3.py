@@ -1,22 +1,135 @@
 """
 API endpoints for Stage 3 AI processing - Follow-up and experience supplementation.
+
+Index usage (the indexes are created at startup in core/database.py):
+- The existing-solution lookup and claim in process_stage3 filter on the
+  unique (userId, experienceId, stage) index; the claim's status conditions
+  only check the single matched document
+- Status, follow-up and previous-stage solution lookups, and experience
+  lookups, filter on _id and are served by the built-in _id index; their
+  userId and stage conditions only check the single matched document
 """
 
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
+from ..core.config import settings
 from ..core.database import get_database
 from ..dependencies import get_current_user
 from ..models.solution import SolutionStatus
 from ..models.user import User
 from ..services.enhanced_ai_service import enhanced_ai_service
-from ..utils.field_encryption import decrypt_solution_data, encrypt_solution_data
+from ..utils.field_encryption import (
+    decrypt_solution_status_inplace,
+    encrypt_solution_data,
+)
+
+logger = logging.getLogger(__name__)
+
+# orjson serializes the responses, including the decrypted content and
+# datetimes, much faster than the stdlib json path
+router = APIRouter(
+    prefix="/api/ai/stage3",
+    tags=["ai-stage3"],
+    default_response_class=ORJSONResponse,
+)
+
+# Fields the status endpoint returns. aiMetadata, follow-up history and user
+# feedback are never returned here, so they are neither loaded nor decrypted.
+_STATUS_PROJECTION = {
+    "status": 1,
+    "stage": 1,
+    "content": 1,
+    "processingTime": 1,
+    "metadata.confidence_score": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "nextFollowUp": 1,
+    "followUpCount": 1,
+    "stage1SolutionId": 1,
+    "stage2SolutionId": 1,
+    "_encryption": 1,  # Needed by decrypt_solution_status_inplace
+}
+
+# Fields the background job passes to the AI service: the experience's form
+# data and media content, and the earlier stages' content and metadata the
+# follow-up plan builds on
+_BACKGROUND_EXPERIENCE_PROJECTION = {"data": 1, "content": 1}
+_PREVIOUS_STAGE_CONTEXT_PROJECTION = {"content": 1, "metadata": 1}
+
+
+def _parse_object_id(value: str, name: str) -> ObjectId:
+    """Convert a client-supplied id to an ObjectId, rejecting malformed ids with 400.
+
+    ObjectId.is_valid checks the format without raising, so bad ids are
+    turned away before any database call instead of surfacing as a 500.
+    """
+    if not ObjectId.is_valid(value):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid {name} ID"
+        )
+    return ObjectId(value)
+
+
+async def _find_previous_solutions(
+    db,
+    stage1_oid: Optional[ObjectId],
+    stage2_oid: Optional[ObjectId],
+    query: Dict[str, Any],
+    projection: Dict[str, Any],
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Fetch the Stage 1 and Stage 2 solutions a Stage 3 run builds on.
+
+    When both ids are given they are read in one query and told apart by
+    their stage; a single id falls back to a find_one. ``query`` holds any
+    extra filter, such as the owning user, and ``projection`` the fields to
+    load.
+    """
+    # The stage tells the batched results apart
+    projection = {**projection, "stage": 1}
 
-router = APIRouter(prefix="/api/ai/stage3", tags=["ai-stage3"])
+    if stage1_oid and stage2_oid:
+        docs = await db.solutions.find(
+            {
+                **query,
+                "_id": {"$in": [stage1_oid, stage2_oid]},
+                "stage": {"$in": [1, 2]},
+            },
+            projection=projection,
+        ).to_list(2)
+        stage1_solution = next(
+            (d for d in docs if d["_id"] == stage1_oid and d["stage"] == 1), None
+        )
+        stage2_solution = next(
+            (d for d in docs if d["_id"] == stage2_oid and d["stage"] == 2), None
+        )
+        return stage1_solution, stage2_solution
+
+    if stage1_oid:
+        return (
+            await db.solutions.find_one(
+                {**query, "_id": stage1_oid, "stage": 1}, projection=projection
+            ),
+            None,
+        )
+    if stage2_oid:
+        return (
+            None,
+            await db.solutions.find_one(
+                {**query, "_id": stage2_oid, "stage": 2}, projection=projection
+            ),
+        )
+    return None, None
 
 
 class FollowUpData(BaseModel):
@@ -48,6 +161,25 @@ class Stage3ProcessingResponse(BaseModel):
     follow_up_scheduled: Optional[str] = None
 
 
+async def _in_progress_response(
+    db, solution_filter: Dict[str, Any]
+) -> Stage3ProcessingResponse:
+    """Report a Stage 3 solution another request is already processing."""
+    existing_solution = await db.solutions.find_one(
+        solution_filter, projection={"_id": 1}
+    )
+    if not existing_solution:
+        raise RuntimeError("Stage 3 solution was removed while claiming it")
+    return Stage3ProcessingResponse(
+        solution_id=str(existing_solution["_id"]),
+        status="processing",
+        stage=3,
+        processing_time=0.0,
+        confidence_score=0.0,
+        message="Stage 3 processing already in progress",
+    )
+
+
 @router.post("/process", response_model=Stage3ProcessingResponse)
 async def process_stage3(
     request: Stage3ProcessingRequest,
@@ -62,12 +194,51 @@ async def process_stage3(
     adaptive recommendations based on user's implementation progress.
     """
     try:
-        # Validate experience exists and belongs to user
-        experience_doc = await db.experiences.find_one(
-            {
-                "_id": ObjectId(request.experience_id),
-                "userId": current_user.id,
-            }
+        # Malformed ids are rejected with 400 before any query; each id is
+        # parsed once and reused by every filter below
+        experience_oid = _parse_object_id(request.experience_id, "experience")
+        stage1_solution_oid = (
+            _parse_object_id(request.stage1_solution_id, "Stage 1 solution")
+            if request.stage1_solution_id
+            else None
+        )
+        stage2_solution_oid = (
+            _parse_object_id(request.stage2_solution_id, "Stage 2 solution")
+            if request.stage2_solution_id
+            else None
+        )
+
+        solution_filter = {
+            "userId": current_user.id,
+            "experienceId": request.experience_id,
+            "stage": 3,
+        }
+
+        # Validate experience exists and belongs to user, check that any
+        # referenced previous stage solutions exist and belong to them too
+        # (in one query when both are referenced), and look up any Stage 3
+        # solution already recorded for the experience. The reads are
+        # independent, so they run concurrently.
+        (
+            experience_doc,
+            (stage1_solution, stage2_solution),
+            existing_solution,
+        ) = await asyncio.gather(
+            db.experiences.find_one(
+                {
+                    "_id": experience_oid,
+                    "userId": current_user.id,
+                },
+                projection={"role": 1},
+            ),
+            _find_previous_solutions(
+                db,
+                stage1_solution_oid,
+                stage2_solution_oid,
+                {"userId": current_user.id},
+                {"_id": 1},
+            ),
+            db.solutions.find_one(solution_filter, projection={"_id": 1}),
         )
 
         if not experience_doc:
@@ -76,86 +247,82 @@ async def process_stage3(
                 detail="Experience not found or access denied",
             )
 
-        # Check if Stage 3 solution already exists
-        existing_solution = await db.solutions.find_one(
-            {
-                "experienceId": request.experience_id,
-                "stage": 3,
-                "userId": current_user.id,
-            }
-        )
-
-        # Get previous stage solutions for context
-        stage1_solution = None
-        stage2_solution = None
-
-        if request.stage1_solution_id:
-            stage1_solution = await db.solutions.find_one(
-                {
-                    "_id": request.stage1_solution_id,
-                    "userId": current_user.id,
-                    "stage": 1,
-                }
+        # The background job would silently run without a context that
+        # doesn't exist, so a bad reference is reported instead
+        if stage1_solution_oid and not stage1_solution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Stage 1 solution not found",
             )
-
-        if request.stage2_solution_id:
-            stage2_solution = await db.solutions.find_one(
-                {
-                    "_id": request.stage2_solution_id,
-                    "userId": current_user.id,
-                    "stage": 2,
-                }
+        if stage2_solution_oid and not stage2_solution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Stage 2 solution not found",
             )
 
-        # Create or update solution record
-        solution_id = None
-        if existing_solution:
-            solution_id = str(existing_solution["_id"])
-            # Update status to processing
-            await db.solutions.update_one(
-                {"_id": ObjectId(solution_id)},
+        # Create the solution record, or move the existing one back to
+        # PROCESSING with the latest follow-up data, in one atomic update.
+        # The claim lives in the database so it holds across worker
+        # processes: a solution a job started within the AI timeout is still
+        # processing doesn't match. Older claims belong to a job that died
+        # with its worker and are taken over. Only a missing solution is
+        # upserted, so a miss never inserts a duplicate; two requests
+        # creating it at once collide on the unique user+experience+stage
+        # index.
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(
+            seconds=settings.AI_PROCESSING_TIMEOUT_SECONDS + 60
+        )
+        follow_up = request.follow_up_data.dict() if request.follow_up_data else None
+        try:
+            solution_doc = await db.solutions.find_one_and_update(
+                {
+                    **solution_filter,
+                    "$or": [
+                        {"status": {"$ne": SolutionStatus.PROCESSING}},
+                        {"processingStartedAt": {"$not": {"$gte": stale_before}}},
+                    ],
+                },
                 {
                     "$set": {
                         "status": SolutionStatus.PROCESSING,
-                        "updatedAt": datetime.utcnow(),
-                        "processingStartedAt": datetime.utcnow(),
-                        "lastFollowUpData": (
-                            request.follow_up_data.dict()
-                            if request.follow_up_data
+                        "updatedAt": now,
+                        "processingStartedAt": now,
+                        "lastFollowUpData": follow_up,
+                    },
+                    "$setOnInsert": {
+                        "stageName": "follow_up_support",
+                        "priority": request.priority,
+                        "stage1SolutionId": (
+                            request.stage1_solution_id
+                            if request.stage1_solution_id
+                            else None
+                        ),
+                        "stage2SolutionId": (
+                            request.stage2_solution_id
+                            if request.stage2_solution_id
                             else None
                         ),
-                    }
+                        "followUpData": follow_up,
+                        "daysSinceInitial": request.days_since_initial or 0,
+                        "createdAt": now,
+                    },
                 },
+                projection={"_id": 1},
+                upsert=existing_solution is None,
+                return_document=ReturnDocument.AFTER,
             )
-        else:
-            # Create new solution record
-            solution_doc = {
-                "userId": current_user.id,
-                "experienceId": request.experience_id,
-                "stage": 3,
-                "stageName": "follow_up_support",
-                "status": SolutionStatus.PROCESSING,
-                "priority": request.priority,
-                "stage1SolutionId": (
-                    request.stage1_solution_id if request.stage1_solution_id else None
-                ),
-                "stage2SolutionId": (
-                    request.stage2_solution_id if request.stage2_solution_id else None
-                ),
-                "followUpData": (
-                    request.follow_up_data.dict() if request.follow_up_data else None
-                ),
-                "daysSinceInitial": request.days_since_initial or 0,
-                "createdAt": datetime.utcnow(),
-                "updatedAt": datetime.utcnow(),
-                "processingStartedAt": datetime.utcnow(),
-            }
+        except DuplicateKeyError:
+            # A concurrent request created the solution first
+            solution_doc = None
+
+        if not solution_doc:
+            return await _in_progress_response(db, solution_filter)
 
-            result = await db.solutions.insert_one(solution_doc)
-            solution_id = result.inserted_id
+        solution_id = solution_doc["_id"]
 
         # Calculate next follow-up date
-        next_follow_up = datetime.utcnow() + timedelta(days=14)  # Default 2 weeks
+        next_follow_up = now + timedelta(days=14)  # Default 2 weeks
 
         # Start background processing
         background_tasks.add_task(
@@ -198,10 +365,11 @@ async def get_stage3_status(
     try:
         solution_doc = await db.solutions.find_one(
             {
-                "_id": ObjectId(solution_id),
+                "_id": _parse_object_id(solution_id, "solution"),
                 "userId": current_user.id,
                 "stage": 3,
-            }
+            },
+            projection=_STATUS_PROJECTION,
         )
 
         if not solution_doc:
@@ -211,41 +379,52 @@ async def get_stage3_status(
             )
 
         # Decrypt solution data using field-level decryption
+        # Only the returned fields are loaded, so just those are decrypted, in
+        # one pass over the freshly loaded document (no copy) on a worker
+        # thread to keep the CPU-bound work off the event loop
         decrypted_solution = solution_doc
         if solution_doc.get("status") == SolutionStatus.COMPLETED:
             try:
-                decrypted_solution = decrypt_solution_data(dict(solution_doc))
+                decrypted_solution = await asyncio.to_thread(
+                    decrypt_solution_status_inplace, solution_doc
+                )
             except Exception as e:
-                print(f"Decryption warning: {e}")
+                logger.warning(
+                    "Failed to decrypt Stage 3 solution %s: %s", solution_id, e
+                )
                 # Fall back to original data if decryption fails
                 decrypted_solution = solution_doc
 
         content = decrypted_solution.get("content", {})
 
-        return {
-            "solution_id": str(solution_doc["_id"]),
-            "status": solution_doc.get("status", SolutionStatus.PROCESSING),
-            "stage": solution_doc.get("stage", 3),
-            "content": content,
-            "processing_time": solution_doc.get("processingTime", 0.0),
-            "confidence_score": solution_doc.get("metadata", {}).get(
-                "confidence_score", 0.0
-            ),
-            "created_at": solution_doc.get("createdAt"),
-            "updated_at": solution_doc.get("updatedAt"),
-            "next_follow_up": solution_doc.get("nextFollowUp"),
-            "follow_up_count": solution_doc.get("followUpCount", 0),
-            "stage1_solution_id": (
-                str(solution_doc["stage1SolutionId"])
-                if solution_doc.get("stage1SolutionId")
-                else None
-            ),
-            "stage2_solution_id": (
-                str(solution_doc["stage2SolutionId"])
-                if solution_doc.get("stage2SolutionId")
-                else None
-            ),
-        }
+        # Returned as a response so FastAPI skips its jsonable_encoder pass
+        # and orjson serializes the content and datetimes directly
+        return ORJSONResponse(
+            {
+                "solution_id": str(solution_doc["_id"]),
+                "status": solution_doc.get("status", SolutionStatus.PROCESSING),
+                "stage": solution_doc.get("stage", 3),
+                "content": content,
+                "processing_time": solution_doc.get("processingTime", 0.0),
+                "confidence_score": solution_doc.get("metadata", {}).get(
+                    "confidence_score", 0.0
+                ),
+                "created_at": solution_doc.get("createdAt"),
+                "updated_at": solution_doc.get("updatedAt"),
+                "next_follow_up": solution_doc.get("nextFollowUp"),
+                "follow_up_count": solution_doc.get("followUpCount", 0),
+                "stage1_solution_id": (
+                    str(solution_doc["stage1SolutionId"])
+                    if solution_doc.get("stage1SolutionId")
+                    else None
+                ),
+                "stage2_solution_id": (
+                    str(solution_doc["stage2SolutionId"])
+                    if solution_doc.get("stage2SolutionId")
+                    else None
+                ),
+            }
+        )
 
     except HTTPException:
         raise
@@ -266,12 +445,29 @@ async def submit_follow_up(
 ):
     """Submit follow-up data for ongoing Stage 3 processing."""
     try:
-        solution_doc = await db.solutions.find_one(
+        # Append the follow-up to the history and count it in one atomic
+        # update, without reading or rewriting the existing history. The
+        # ownership and stage checks are part of the filter, so no match
+        # means the solution doesn't exist for this user.
+        now = datetime.now(timezone.utc)
+        follow_up = follow_up_data.dict()
+        solution_doc = await db.solutions.find_one_and_update(
             {
-                "_id": ObjectId(solution_id),
+                "_id": _parse_object_id(solution_id, "solution"),
                 "userId": current_user.id,
                 "stage": 3,
-            }
+            },
+            {
+                "$push": {"followUpHistory": {"timestamp": now, "data": follow_up}},
+                "$inc": {"followUpCount": 1},
+                "$set": {
+                    "lastFollowUpData": follow_up,
+                    "status": SolutionStatus.PROCESSING,
+                    "updatedAt": now,
+                },
+            },
+            projection={"followUpCount": 1},
+            return_document=ReturnDocument.AFTER,
         )
 
         if not solution_doc:
@@ -280,36 +476,17 @@ async def submit_follow_up(
                 detail="Stage 3 solution not found",
             )
 
-        # Update solution with new follow-up data
-        follow_up_history = solution_doc.get("followUpHistory", [])
-        follow_up_history.append(
-            {"timestamp": datetime.utcnow(), "data": follow_up_data.dict()}
-        )
-
-        await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
-            {
-                "$set": {
-                    "lastFollowUpData": follow_up_data.dict(),
-                    "followUpHistory": follow_up_history,
-                    "followUpCount": len(follow_up_history),
-                    "status": SolutionStatus.PROCESSING,
-                    "updatedAt": datetime.utcnow(),
-                }
-            },
-        )
-
         # Trigger new processing based on follow-up data
         background_tasks.add_task(
             process_follow_up_background,
             solution_id,
-            follow_up_data.dict(),
+            follow_up,
             current_user.role,
         )
 
         return {
             "message": "Follow-up data submitted successfully",
-            "follow_up_count": len(follow_up_history),
+            "follow_up_count": solution_doc["followUpCount"],
             "processing_started": True,
         }
 
@@ -348,8 +525,8 @@ async def process_stage3_background(
         additional_context (Dict[str, Any]): Extra context and preferences
 
     Processing Flow:
-        1. Establishes database connection for background processing
-        2. Retrieves experience and all previous stage solutions for context
+        1. Uses the application's shared database connection pool
+        2. Retrieves experience and all previous stage solutions concurrently
         3. Calls enhanced AI service for Stage 3 follow-up processing
         4. Calculates processing time and schedules next follow-up
         5. Updates solution record with results and follow-up schedule
@@ -371,57 +548,69 @@ async def process_stage3_background(
     Error Handling:
         - Comprehensive error logging for debugging and monitoring
         - Solution status updated to GENERATED for retry capability
+        - AI calls running past AI_PROCESSING_TIMEOUT_SECONDS fail the solution
         - Processing time tracked even for failed attempts
         - Database connection errors handled gracefully
     """
-    # Track processing time for performance monitoring and follow-up scheduling
-    start_time = datetime.utcnow()
+    # Track processing time for performance monitoring; the monotonic clock
+    # keeps the duration right if the system clock is adjusted mid-job
+    start_time = time.monotonic()
+    # Background tasks run outside the request's dependency scope, so the
+    # shared pooled client is fetched directly; the error path reuses it
+    db = get_database()
+    # Parsed once; the success and error writes both target this solution
+    solution_oid = ObjectId(solution_id)
 
     try:
-        # Get database connection for background task processing
-        db = get_database()
-
         # Get original experience data for context continuity
         # This maintains connection to the user's initial situation
-        experience_doc = await db.experiences.find_one({"_id": ObjectId(experience_id)})
+        # Get previous stage solutions for comprehensive context integration
+        # Stage 3 builds upon both emotional healing and practical solutions:
+        # Stage 1 provides emotional healing context for follow-up support,
+        # Stage 2 provides practical solutions context for progress tracking
+        # The reads are independent and run concurrently
+        (
+            experience_doc,
+            (stage1_solution_doc, stage2_solution_doc),
+        ) = await asyncio.gather(
+            db.experiences.find_one(
+                {"_id": ObjectId(experience_id)},
+                projection=_BACKGROUND_EXPERIENCE_PROJECTION,
+            ),
+            _find_previous_solutions(
+                db,
+                ObjectId(stage1_solution_id) if stage1_solution_id else None,
+                ObjectId(stage2_solution_id) if stage2_solution_id else None,
+                {},
+                _PREVIOUS_STAGE_CONTEXT_PROJECTION,
+            ),
+        )
 
         if not experience_doc:
             raise Exception("Experience not found")
 
-        # Get previous stage solutions for comprehensive context integration
-        # Stage 3 builds upon both emotional healing and practical solutions
-        stage1_solution_doc = None
-        stage2_solution_doc = None
-
-        if stage1_solution_id:
-            # Stage 1 provides emotional healing context for follow-up support
-            stage1_solution_doc = await db.solutions.find_one(
-                {"_id": ObjectId(stage1_solution_id)}
-            )
-
-        if stage2_solution_id:
-            # Stage 2 provides practical solutions context for progress tracking
-            stage2_solution_doc = await db.solutions.find_one(
-                {"_id": ObjectId(stage2_solution_id)}
-            )
-
         # Process with enhanced AI service for Stage 3 follow-up support
         # This generates long-term growth plans and adaptive recommendations
-        processing_result = await enhanced_ai_service.process_experience_stage3(
-            experience_data=experience_doc,  # Original user experience for context
-            stage1_solution=stage1_solution_doc,  # Emotional healing context
-            stage2_solution=stage2_solution_doc,  # Practical solutions context
-            follow_up_data=follow_up_data,  # User's progress and feedback
-            user_role=user_role,  # Role-specific long-term guidance
-            additional_context=additional_context,  # Extra preferences and context
+        # The job runs in the API process, so a hung AI call is cut off rather
+        # than holding its connection and memory indefinitely
+        processing_result = await asyncio.wait_for(
+            enhanced_ai_service.process_experience_stage3(
+                experience_data=experience_doc,  # Original user experience for context
+                stage1_solution=stage1_solution_doc,  # Emotional healing context
+                stage2_solution=stage2_solution_doc,  # Practical solutions context
+                follow_up_data=follow_up_data,  # User's progress and feedback
+                user_role=user_role,  # Role-specific long-term guidance
+                additional_context=additional_context,  # Extra preferences and context
+            ),
+            timeout=settings.AI_PROCESSING_TIMEOUT_SECONDS,
         )
 
         # Calculate processing time and schedule next follow-up session
         # Default 14-day interval for regular progress check-ins
-        processing_time = (datetime.utcnow() - start_time).total_seconds()
-        next_follow_up = datetime.utcnow() + timedelta(
-            days=14
-        )  # 2-week follow-up cycle
+        processing_time = time.monotonic() - start_time
+        # One clock read serves the follow-up date and completion timestamps
+        now = datetime.now(timezone.utc)
+        next_follow_up = now + timedelta(days=14)  # 2-week follow-up cycle
 
         solution_data = {
             "status": SolutionStatus.COMPLETED,  # Mark as successfully completed
@@ -443,45 +632,56 @@ async def process_stage3_background(
             },
             "processingTime": processing_time,  # Duplicate for compatibility
             "nextFollowUp": next_follow_up,  # Scheduled next follow-up date
-            "updatedAt": datetime.utcnow(),  # Last update timestamp
-            "completedAt": datetime.utcnow(),  # Completion timestamp
+            "updatedAt": now,  # Last update timestamp
+            "completedAt": now,  # Completion timestamp
         }
 
         # Apply field-level encryption
         encrypted_solution_data = encrypt_solution_data(solution_data)
 
         await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
+            {"_id": solution_oid},
             {"$set": encrypted_solution_data},
         )
 
         # Log successful completion for monitoring and follow-up tracking
-        print(f"✅ Stage 3 processing completed for solution {solution_id}")
+        logger.info("Stage 3 processing completed for solution %s", solution_id)
 
     except Exception as e:
         # Log processing failure with details for debugging and support
-        print(f"❌ Stage 3 processing failed for solution {solution_id}: {e}")
+        logger.exception(
+            "Stage 3 processing failed for solution %s",
+            solution_id,
+            extra={"solution_id": solution_id},
+        )
 
         # Update solution with error status and preserve processing attempt data
         # Status is set to GENERATED (not FAILED) to allow retry attempts
         try:
-            db = get_database()
             await db.solutions.update_one(
-                {"_id": ObjectId(solution_id)},
+                {"_id": solution_oid},
                 {
                     "$set": {
                         "status": SolutionStatus.GENERATED,  # Retry-able status
-                        "error": str(e),  # Error details for debugging
-                        "updatedAt": datetime.utcnow(),  # Update timestamp
-                        "processingTime": (
-                            datetime.utcnow() - start_time
-                        ).total_seconds(),  # Time spent before failure
-                    }
+                        # Error details for debugging
+                        "error": (
+                            "Stage 3 AI processing timed out"
+                            if isinstance(e, asyncio.TimeoutError)
+                            else str(e)
+                        ),
+                        # Time spent before failure
+                        "processingTime": time.monotonic() - start_time,
+                    },
+                    "$currentDate": {"updatedAt": True},  # Update timestamp
                 },
             )
         except Exception as db_error:
             # Log database update failures for system monitoring
-            print(f"Failed to update solution error status: {db_error}")
+            logger.error(
+                "Failed to update error status for Stage 3 solution %s: %s",
+                solution_id,
+                db_error,
+            )
 
 
 async def process_follow_up_background(
@@ -525,13 +725,19 @@ async def process_follow_up_background(
         - Preserves original solution content if adaptation fails
         - Logs adaptation failures for system monitoring
     """
-    try:
-        # Get database connection for follow-up processing
-        db = get_database()
+    # Shared pooled client, fetched directly outside the request scope
+    db = get_database()
+    # Parsed once; the lookup and the update both target this solution
+    solution_oid = ObjectId(solution_id)
 
+    try:
         # Get current Stage 3 solution for context and baseline
         # This provides the foundation for adaptive recommendations
-        solution_doc = await db.solutions.find_one({"_id": ObjectId(solution_id)})
+        # The adaptation is driven by the follow-up data alone, so only the
+        # solution's existence is checked
+        solution_doc = await db.solutions.find_one(
+            {"_id": solution_oid}, projection={"_id": 1}
+        )
 
         if not solution_doc:
             raise Exception("Solution not found")
@@ -546,8 +752,9 @@ async def process_follow_up_background(
 
         # Update solution with adaptive recommendations and progress assessment
         # This enhances the original solution with real-world implementation insights
+        now = datetime.now(timezone.utc)
         await db.solutions.update_one(
-            {"_id": ObjectId(solution_id)},
+            {"_id": solution_oid},
             {
                 "$set": {
                     "adaptiveRecommendations": adaptive_result[
@@ -557,16 +764,20 @@ async def process_follow_up_background(
                         "progress_assessment"
                     ],  # Progress analysis
                     "status": SolutionStatus.COMPLETED,  # Maintain completed status
-                    "updatedAt": datetime.utcnow(),  # Update timestamp
-                    "lastAdaptation": datetime.utcnow(),  # Track last adaptation time
+                    "updatedAt": now,  # Update timestamp
+                    "lastAdaptation": now,  # Track last adaptation time
                 }
             },
         )
 
         # Log successful adaptation for monitoring and user support tracking
-        print(f"✅ Follow-up adaptation completed for solution {solution_id}")
+        logger.info("Follow-up adaptation completed for solution %s", solution_id)
 
-    except Exception as e:
+    except Exception:
         # Log adaptation failure with details for debugging and system monitoring
         # Note: Solution status is not changed on adaptation failure to preserve original content
-        print(f"❌ Follow-up adaptation failed for solution {solution_id}: {e}")
+        logger.exception(
+            "Follow-up adaptation failed for solution %s",
+            solution_id,
+            extra={"solution_id": solution_id},
+        )
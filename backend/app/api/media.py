@@ -377,7 +377,7 @@ async def get_media_stats(current_user: dict = Depends(get_current_user)):
         ]
 
         stats = {}
-        async for result in media_collection.aggregate(pipeline):
+        async for result in await media_collection.aggregate(pipeline):
             media_type = result["_id"]
             stats[media_type] = {
                 "count": result["count"],
@@ -355,7 +355,7 @@ async def get_security_statistics(current_user: User = Depends(get_current_user)
         last_week = datetime.utcnow() - timedelta(days=7)
 
         # Access statistics
-        access_stats = await secure_data_service.db.access_logs.aggregate(
+        access_stats_cursor = await secure_data_service.db.access_logs.aggregate(
             [
                 {
                     "$match": {
@@ -370,7 +370,8 @@ async def get_security_statistics(current_user: User = Depends(get_current_user)
                     }
                 },
             ]
-        ).to_list(length=None)
+        )
+        access_stats = await access_stats_cursor.to_list(length=None)
 
         # Data inventory summary
         inventory = await secure_data_service.get_user_data_inventory(current_user.id)
@@ -281,7 +281,7 @@ async def get_quick_insights(
             },
         ]
 
-        cursor = db.solution_ratings.aggregate(pipeline)
+        cursor = await db.solution_ratings.aggregate(pipeline)
         result = await cursor.to_list(1)
 
         if not result:
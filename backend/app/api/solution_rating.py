@@ -327,7 +327,8 @@ async def get_rating_analytics(
             },
         ]
 
-        result = await db.solution_ratings.aggregate(pipeline).to_list(length=1)
+        cursor = await db.solution_ratings.aggregate(pipeline)
+        result = await cursor.to_list(length=1)
 
         if not result:
             return {
@@ -54,6 +54,21 @@ class Settings(BaseSettings):
     MONGO_DB: str = os.getenv(
         "MONGO_DB", "life_experience_platform"
     )  # Target database name for application data
+    MONGO_MAX_POOL_SIZE: int = int(
+        os.getenv("MONGO_MAX_POOL_SIZE", "100")
+    )  # Upper bound on pooled connections shared by requests and background jobs
+    MONGO_MIN_POOL_SIZE: int = int(
+        os.getenv("MONGO_MIN_POOL_SIZE", "10")
+    )  # Connections kept open so bursts of AI jobs skip the connect/TLS/auth handshake
+    MONGO_MAX_IDLE_TIME_MS: int = int(
+        os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")
+    )  # Idle connections above the minimum are closed after this long
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(
+        os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "10000")
+    )  # Fail an operation instead of queueing forever when the pool is exhausted
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(
+        os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")
+    )  # How long operations wait for a reachable server before failing
 
     # JWT Authentication Configuration
     # CRITICAL: Change JWT_SECRET_KEY in production to a cryptographically secure random value
@@ -80,6 +95,14 @@ class Settings(BaseSettings):
         "OPENAI_API_URL", "https://api.openai.com/v1"
     )  # OpenAI API base URL - can be changed for compatible APIs
     MODEL_ID: str = os.getenv("MODEL_ID", "gpt-4")
+    AI_PROCESSING_TIMEOUT_SECONDS: float = float(
+        os.getenv("AI_PROCESSING_TIMEOUT_SECONDS", "180")
+    )  # Upper bound for one AI pipeline call, covering client timeout plus retries
+
+    # Logging Configuration
+    LOG_LEVEL: str = os.getenv(
+        "LOG_LEVEL", "INFO"
+    )  # Level for application loggers (DEBUG, INFO, WARNING, ERROR)
 
     # File Upload and Storage Configuration
     # Multi-modal experience collection requires secure file handling for images, audio, and video
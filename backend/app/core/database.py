@@ -3,7 +3,7 @@ Database Configuration and Connection Management
 
 This module handles all MongoDB database operations for the Mortal Stardust platform.
 It provides async connection management, collection access, and database initialization
-using the Motor async driver for optimal performance in the FastAPI async environment.
+using PyMongo's native asyncio driver for optimal performance in the FastAPI async environment.
 
 The database architecture supports:
 - Async connection pooling for high-concurrency operations
@@ -20,22 +20,23 @@ Key Collections:
 - media_files: Uploaded multimedia content (images, audio, video)
 - experience_summaries: Processed experience analysis results
 - analytics_results: User analytics and insights data
+- ai_cache: Encrypted Stage 1 AI responses keyed by input hash (TTL-expired)
 
 Performance Considerations:
 - Compound indexes for common query patterns (userId + createdAt)
-- Unique indexes for data integrity (email, user+solution ratings)
+- Unique indexes for data integrity (email, user+solution ratings,
+  user+experience+stage solutions)
 - Background index creation to avoid blocking operations
 - Connection pooling to handle concurrent requests efficiently
 
 Dependencies:
-- Motor: Async MongoDB driver for Python
-- PyMongo: MongoDB driver for connection and error handling
+- PyMongo: MongoDB driver; its AsyncMongoClient runs I/O on the event loop
 - Pydantic Settings: Configuration management from environment variables
 """
 
 import logging
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from pymongo.errors import ConnectionFailure
 
 from ..models.experience_summary import initialize_experience_summary_database
@@ -53,12 +54,18 @@ class Database:
     created and shared across all requests.
 
     Attributes:
-        client (AsyncIOMotorClient): The MongoDB async client with connection pooling
+        client (AsyncMongoClient): The MongoDB async client with connection pooling
         database: The specific database instance for the application
+        experiences: Cached handle for the experiences collection
+        solutions: Cached handle for the solutions collection
     """
 
-    client: AsyncIOMotorClient = None
+    client: AsyncMongoClient = None
     database = None
+    # PyMongo builds a new collection object on every attribute access, so the
+    # collections used on the AI processing hot path are resolved once here
+    experiences = None
+    solutions = None
 
 
 # Global database instance - singleton pattern for connection management
@@ -70,18 +77,21 @@ async def connect_db():
     """
     Establish async MongoDB connection with comprehensive initialization.
 
-    This function creates the MongoDB connection using Motor's AsyncIOMotorClient,
+    This function creates the MongoDB connection using PyMongo's AsyncMongoClient,
     which provides connection pooling and async operation support. The connection
     process includes validation, index creation, and database schema initialization.
 
     Connection Process:
-    1. Create AsyncIOMotorClient with connection string from settings
+    1. Create AsyncMongoClient with connection string and pool sizing from settings
     2. Select the target database from the client
     3. Test connectivity with admin ping command
     4. Initialize all collection indexes for optimal query performance
     5. Set up experience summary database components and collections
 
-    The Motor client automatically handles:
+    Unlike Motor, which ran the synchronous driver in a thread pool, the
+    client performs network I/O directly on the asyncio event loop.
+
+    The client automatically handles:
     - Connection pooling with configurable pool size
     - Automatic reconnection on connection failures
     - Load balancing across replica set members
@@ -96,9 +106,22 @@ async def connect_db():
     """
     try:
         # Create async MongoDB client with connection pooling
-        # Motor automatically manages connection pool size and lifecycle
-        db.client = AsyncIOMotorClient(settings.MONGO_URI)
+        # The client manages the pool lifecycle; the pool is shared by request
+        # handlers and in-process background jobs, and a few connections are
+        # kept warm so a burst of jobs doesn't pay the handshake each time
+        db.client = AsyncMongoClient(
+            settings.MONGO_URI,
+            maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+            # Bounded waits, so a saturated pool or an unreachable server
+            # surfaces as an error rather than requests hanging
+            waitQueueTimeoutMS=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        )
         db.database = db.client[settings.MONGO_DB]
+        db.experiences = db.database.experiences
+        db.solutions = db.database.solutions
 
         # Test the connection with a lightweight ping command
         # This ensures the database is accessible before proceeding
@@ -126,7 +149,7 @@ async def close_db():
     application shuts down. It closes the connection pool and releases any
     associated resources to prevent connection leaks.
 
-    The Motor client handles:
+    The client handles:
     - Closing all active connections in the pool
     - Canceling any pending operations
     - Releasing network resources
@@ -137,7 +160,7 @@ async def close_db():
     environments where applications may be frequently restarted.
     """
     if db.client:
-        db.client.close()
+        await db.client.close()
         logger.info("📴 MongoDB connection closed")
 
 
@@ -184,7 +207,7 @@ def get_experiences_collection():
     Returns:
         Collection: MongoDB collection for experience documents
     """
-    return db.database.experiences
+    return db.experiences
 
 
 def get_solutions_collection():
@@ -199,7 +222,7 @@ def get_solutions_collection():
     Returns:
         Collection: MongoDB collection for solution documents
     """
-    return db.database.solutions
+    return db.solutions
 
 
 def get_activity_logs_collection():
@@ -286,6 +309,92 @@ def get_analytics_results_collection():
     return db.database.analytics_results
 
 
+# Name of the non-unique (userId, experienceId, stage) index created by
+# earlier deployments. MongoDB can't add the unique flag to an existing index
+# or build a second one on the same key pattern, so the unique index uses a
+# different field order and the legacy one is dropped once it exists.
+_LEGACY_SOLUTION_INDEX = "userId_1_experienceId_1_stage_1"
+_SOLUTION_KEY_FIELDS = frozenset(("userId", "experienceId", "stage"))
+
+
+async def _create_index(collection, keys, **kwargs) -> None:
+    """Create one index, logging a failure instead of raising.
+
+    Each index is independent, so one that can't be built (permissions, an
+    options conflict, ...) must not keep the others from being created.
+    """
+    try:
+        await collection.create_index(keys, **kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to create index {keys!r} on {collection.name}: {e}")
+
+
+async def _ensure_unique_solution_index() -> None:
+    """Make (userId, experienceId, stage) unique on the solutions collection.
+
+    The atomic upserts that claim a solution in the AI processing and stage
+    routers rely on this index to prevent duplicate solutions. Existing
+    duplicates are not deleted automatically, since choosing which solution
+    a user keeps is a data decision: they are reported at error level, the
+    legacy index is kept, and the build is retried on the next startup.
+    """
+    solutions = db.database.solutions
+    try:
+        indexes = await solutions.index_information()
+        if any(
+            info.get("unique")
+            and frozenset(field for field, _ in info["key"]) == _SOLUTION_KEY_FIELDS
+            for info in indexes.values()
+        ):
+            return
+
+        cursor = await solutions.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": {
+                            "userId": "$userId",
+                            "experienceId": "$experienceId",
+                            "stage": "$stage",
+                        },
+                        "count": {"$sum": 1},
+                    }
+                },
+                {"$match": {"count": {"$gt": 1}}},
+                {"$limit": 5},
+            ]
+        )
+        duplicates = await cursor.to_list(5)
+        if duplicates:
+            logger.error(
+                "❌ Solutions contain duplicate user+experience+stage records "
+                "(e.g. %s); the unique solutions index was not created. Remove "
+                "the duplicates and restart to build it.",
+                [group["_id"] for group in duplicates],
+            )
+            return
+
+        # Equality matches may list these fields in any order, so this also
+        # serves the stage routers' (experienceId, stage, userId) lookups, and
+        # its experienceId+userId prefix covers per-experience lists sorted by
+        # stage. No separate compound index is needed for those shapes.
+        # Lookups by _id (the stage status/result endpoints, including their
+        # userId and stage checks) match at most one document through the
+        # built-in _id index, so indexes leading with _id would go unused.
+        await solutions.create_index(
+            [("experienceId", 1), ("userId", 1), ("stage", 1)], unique=True
+        )  # Complete solution lookup for user+experience+stage, no duplicates
+
+        # The unique index now covers the same queries
+        if _LEGACY_SOLUTION_INDEX in indexes:
+            await solutions.drop_index(_LEGACY_SOLUTION_INDEX)
+    except Exception as e:
+        logger.error(
+            f"❌ Failed to create the unique solutions index; duplicate "
+            f"solutions can be created until it exists: {e}"
+        )
+
+
 async def init_database_indexes():
     """
     Initialize comprehensive database indexes for optimal query performance.
@@ -317,138 +426,149 @@ async def init_database_indexes():
     """
     try:
         # Users collection indexes - Authentication and user management optimization
-        await db.database.users.create_index(
-            "email", unique=True
+        await _create_index(
+            db.database.users, "email", unique=True
         )  # Fast login lookup, prevent duplicate accounts
-        await db.database.users.create_index(
-            "createdAt"
+        await _create_index(
+            db.database.users, "createdAt"
         )  # User registration analytics and admin queries
 
         # Experiences collection indexes - User experience retrieval and timeline optimization
-        await db.database.experiences.create_index(
-            "userId"
+        await _create_index(
+            db.database.experiences, "userId"
         )  # Fast user-specific experience queries
-        await db.database.experiences.create_index(
-            "createdAt"
+        await _create_index(
+            db.database.experiences, "createdAt"
         )  # Global experience timeline and analytics
-        await db.database.experiences.create_index(
-            [("userId", 1), ("createdAt", -1)]
+        await _create_index(
+            db.database.experiences, [("userId", 1), ("createdAt", -1)]
         )  # User timeline with newest first
 
         # Solutions collection indexes - AI processing pipeline optimization
-        await db.database.solutions.create_index(
-            "userId"
+        await _create_index(
+            db.database.solutions, "userId"
         )  # User-specific solution queries
-        await db.database.solutions.create_index(
-            "experienceId"
+        await _create_index(
+            db.database.solutions, "experienceId"
         )  # Solutions for specific experiences
-        await db.database.solutions.create_index(
-            "stage"
+        await _create_index(
+            db.database.solutions, "stage"
         )  # Stage-specific processing queries
-        await db.database.solutions.create_index(
-            "status"
+        await _create_index(
+            db.database.solutions, "status"
         )  # Processing status filtering
-        await db.database.solutions.create_index(
-            [("userId", 1), ("stage", 1)]
+        await _create_index(
+            db.database.solutions, [("userId", 1), ("stage", 1)]
         )  # User solutions by processing stage
-        await db.database.solutions.create_index(
-            [("userId", 1), ("experienceId", 1), ("stage", 1)]
-        )  # Complete solution lookup for user+experience+stage
+        # One solution per user+experience+stage; built in its own step so
+        # existing duplicates or a failed build are reported loudly and don't
+        # affect the other indexes
+        await _ensure_unique_solution_index()
 
         # Solution ratings collection indexes - Feedback system and analytics optimization
-        await db.database.solution_ratings.create_index(
-            "userId"
+        await _create_index(
+            db.database.solution_ratings, "userId"
         )  # User-specific rating queries
-        await db.database.solution_ratings.create_index(
-            "solutionId"
+        await _create_index(
+            db.database.solution_ratings, "solutionId"
         )  # Ratings for specific solutions
-        await db.database.solution_ratings.create_index(
-            "experienceId"
+        await _create_index(
+            db.database.solution_ratings, "experienceId"
         )  # Experience-based rating analysis
-        await db.database.solution_ratings.create_index(
-            "ratingPercentage"
+        await _create_index(
+            db.database.solution_ratings, "ratingPercentage"
         )  # Rating value filtering and sorting
-        await db.database.solution_ratings.create_index(
-            [("userId", 1), ("solutionId", 1)], unique=True
+        await _create_index(
+            db.database.solution_ratings,
+            [("userId", 1), ("solutionId", 1)],
+            unique=True,
         )  # Prevent duplicate ratings from same user for same solution
-        await db.database.solution_ratings.create_index(
-            "createdAt"
+        await _create_index(
+            db.database.solution_ratings, "createdAt"
         )  # Rating timeline and trends
 
         # Successful solutions collection indexes - High-quality solution tracking
-        await db.database.successful_solutions.create_index(
-            "userId"
+        await _create_index(
+            db.database.successful_solutions, "userId"
         )  # User success pattern analysis
-        await db.database.successful_solutions.create_index(
-            "solutionId"
+        await _create_index(
+            db.database.successful_solutions, "solutionId"
         )  # Reference to original solution
-        await db.database.successful_solutions.create_index(
-            "ratingPercentage"
+        await _create_index(
+            db.database.successful_solutions, "ratingPercentage"
         )  # Success threshold filtering
-        await db.database.successful_solutions.create_index(
-            "recordedAt"
+        await _create_index(
+            db.database.successful_solutions, "recordedAt"
         )  # Success timeline tracking
 
         # Media files collection indexes - Multimedia content management
-        await db.database.media_files.create_index(
-            "userId"
+        await _create_index(
+            db.database.media_files, "userId"
         )  # User-specific media queries
-        await db.database.media_files.create_index(
-            "uploadedAt"
+        await _create_index(
+            db.database.media_files, "uploadedAt"
         )  # Media timeline and cleanup operations
-        await db.database.media_files.create_index(
-            "mediaType"
+        await _create_index(
+            db.database.media_files, "mediaType"
         )  # Media type filtering (image, audio, video)
+        await _create_index(
+            db.database.media_files, [("userId", 1), ("experienceId", 1)]
+        )  # Media attached to a user's experience (Stage 1 AI input)
+
+        # AI response cache indexes - Stage 1 results reused for identical input
+        await _create_index(
+            db.database.ai_cache, "createdAt", expireAfterSeconds=7 * 86400
+        )  # Expire cached AI responses after a week
 
         # Activity logs collection indexes - User behavior tracking and analytics
-        await db.database.activity_logs.create_index(
-            "userId"
+        await _create_index(
+            db.database.activity_logs, "userId"
         )  # User-specific activity analysis
-        await db.database.activity_logs.create_index(
-            "timestamp"
+        await _create_index(
+            db.database.activity_logs, "timestamp"
         )  # Activity timeline and time-based queries
-        await db.database.activity_logs.create_index(
-            "action"
+        await _create_index(
+            db.database.activity_logs, "action"
         )  # Action type filtering and analytics
 
         # Experience summaries collection indexes - AI analysis results optimization
-        await db.database.experience_summaries.create_index(
-            "user_id"
+        await _create_index(
+            db.database.experience_summaries, "user_id"
         )  # User-specific summary queries
-        await db.database.experience_summaries.create_index(
-            "experience_id"
+        await _create_index(
+            db.database.experience_summaries, "experience_id"
         )  # Summaries for specific experiences
-        await db.database.experience_summaries.create_index(
-            "stage"
+        await _create_index(
+            db.database.experience_summaries, "stage"
         )  # Processing stage filtering
-        await db.database.experience_summaries.create_index(
-            "created_at"
+        await _create_index(
+            db.database.experience_summaries, "created_at"
         )  # Summary timeline queries
-        await db.database.experience_summaries.create_index(
-            [("user_id", 1), ("experience_id", 1)]
+        await _create_index(
+            db.database.experience_summaries, [("user_id", 1), ("experience_id", 1)]
         )  # Complete summary lookup for user+experience
-        await db.database.experience_summaries.create_index(
-            [("user_id", 1), ("created_at", -1)]
+        await _create_index(
+            db.database.experience_summaries, [("user_id", 1), ("created_at", -1)]
         )  # User summary timeline with newest first
 
         # Analytics results collection indexes - User insights and metrics optimization
-        await db.database.analytics_results.create_index(
-            "user_id"
+        await _create_index(
+            db.database.analytics_results, "user_id"
         )  # User-specific analytics queries
-        await db.database.analytics_results.create_index(
-            "analytics_type"
+        await _create_index(
+            db.database.analytics_results, "analytics_type"
         )  # Analytics type filtering
-        await db.database.analytics_results.create_index(
-            "created_at"
+        await _create_index(
+            db.database.analytics_results, "created_at"
         )  # Analytics timeline queries
-        await db.database.analytics_results.create_index(
-            [("user_id", 1), ("analytics_type", 1)]
+        await _create_index(
+            db.database.analytics_results, [("user_id", 1), ("analytics_type", 1)]
         )  # Specific analytics for user by type
-        await db.database.analytics_results.create_index(
-            [("user_id", 1), ("created_at", -1)]
+        await _create_index(
+            db.database.analytics_results, [("user_id", 1), ("created_at", -1)]
         )  # User analytics timeline with newest first
 
-        logger.info("✅ Database indexes initialized successfully")
+        logger.info("✅ Database index initialization finished")
 
     except Exception as e:
         logger.warning(f"⚠️ Failed to create some database indexes: {e}")
@@ -0,0 +1,70 @@
+"""
+Non-blocking Application Logging
+
+This module routes the application's log records through a queue so that
+request handlers and background tasks never block on log output. Loggers only
+enqueue records; a single listener thread formats them and writes to stderr.
+
+Design:
+- Only the "app" package logger is configured, so uvicorn's own access and
+  error logging keep their existing handlers and format
+- A QueueHandler on the "app" logger hands records to an in-memory queue
+- A QueueListener thread drains the queue to a stderr StreamHandler
+- The listener is started on application startup and stopped on shutdown,
+  which flushes any records still queued
+
+Usage:
+    logger = logging.getLogger(__name__)  # in any module under app/
+    logger.exception("Stage 1 processing failed", extra={"solution_id": ...})
+"""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config import settings
+
+# Parent logger of every module under app/ (module loggers use __name__)
+APP_LOGGER_NAME = "app"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def start_queue_logging() -> None:
+    """Attach a queue-backed handler to the app logger and start its listener.
+
+    Safe to call more than once; only the first call configures logging.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+    _queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    app_logger.addHandler(_queue_handler)
+    app_logger.setLevel(settings.LOG_LEVEL)
+
+
+def stop_queue_logging() -> None:
+    """Stop the listener thread after writing out any queued records."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    logging.getLogger(APP_LOGGER_NAME).removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
@@ -8,7 +8,7 @@ from typing import Optional
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.asynchronous.database import AsyncDatabase
 
 from .core.config import settings
 from .core.database import get_database
@@ -20,7 +20,7 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> User:
     """
     Get the current authenticated user from JWT token.
@@ -122,7 +122,7 @@ async def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     ),
-    db: AsyncIOMotorDatabase = Depends(get_database),
+    db: AsyncDatabase = Depends(get_database),
 ) -> Optional[User]:
     """
     Get the current user if authenticated, None otherwise.
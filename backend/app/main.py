@@ -8,7 +8,7 @@ and receive personalized guidance.
 
 The application follows a modular architecture with:
 - Feature-based API routers organized by domain (auth, experiences, solutions, AI processing)
-- Async MongoDB operations with Motor driver for scalable data persistence
+- Async MongoDB operations with the PyMongo async driver for scalable data persistence
 - JWT-based authentication with HTTP Bearer token security
 - CORS middleware configured for frontend integration
 - Comprehensive error handling and logging throughout the request lifecycle
@@ -22,7 +22,7 @@ Key Components:
 
 Dependencies:
 - FastAPI: Modern async web framework for building APIs
-- Motor: Async MongoDB driver for database operations
+- PyMongo: Async MongoDB driver for database operations
 - Pydantic: Data validation and settings management
 - OpenAI: AI model integration for experience processing
 - Cryptography: AES-256 encryption for sensitive data protection
@@ -52,7 +52,9 @@ from .api import (
     users,
 )
 from .core.database import close_db, connect_db
+from .core.logging_config import start_queue_logging, stop_queue_logging
 from .routers import role_templates
+from .services.ai_service import get_ai_service
 
 # Load environment variables from .env file for local development
 # This must be called before importing any modules that depend on environment variables
@@ -101,16 +103,22 @@ async def startup_event():
     and initializes any required collections or data structures.
 
     The startup process includes:
+    - Starting the queue-backed application log listener
     - Connecting to MongoDB using the configured connection string
     - Testing the database connection with a ping command
     - Creating optimized indexes for all collections to improve query performance
     - Initializing experience summary database components
+    - Failing Stage 1 jobs left in PROCESSING by a previous restart
+    - Warming the shared AI service so the first request doesn't build it
     - Setting up any background tasks or scheduled jobs
 
     If the database connection fails, the application will not start properly
     and will raise a ConnectionFailure exception.
     """
+    start_queue_logging()
     await connect_db()
+    await ai_stage1.fail_interrupted_stage1_jobs()
+    get_ai_service()
     print("✅ FastAPI backend started successfully")
 
 
@@ -128,12 +136,14 @@ async def shutdown_event():
     - Canceling any running background tasks
     - Flushing any pending database operations
     - Cleaning up temporary files and cache
+    - Flushing queued log records and stopping the log listener
 
     This is critical for production deployments where the application
     may be restarted or scaled down frequently.
     """
     await close_db()
     print("📴 FastAPI backend stopped")
+    stop_queue_logging()
 
 
 # Health check endpoint for monitoring and load balancer probes
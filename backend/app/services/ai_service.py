@@ -29,6 +29,7 @@ Security Considerations:
 """
 
 import time
+from functools import lru_cache
 from typing import Any, Dict
 
 import openai
@@ -635,3 +636,16 @@ class AIService:
                 "version": "1.0",
             },
         }
+
+
+@lru_cache(maxsize=1)
+def get_ai_service() -> AIService:
+    """
+    Return the process-wide AIService instance.
+
+    The service (and its OpenAI HTTP client) is built on first use rather than
+    at import time, so it is created inside each worker after fork. Routes take
+    it via ``Depends(get_ai_service)``, which also lets tests swap it out with
+    ``app.dependency_overrides``.
+    """
+    return AIService()
@@ -656,9 +656,8 @@ class DataRetentionService:
                 },
             ]
 
-            results = await self.db.data_retention_tracking.aggregate(pipeline).to_list(
-                length=None
-            )
+            cursor = await self.db.data_retention_tracking.aggregate(pipeline)
+            results = await cursor.to_list(length=None)
 
             summary = {}
             for result in results:
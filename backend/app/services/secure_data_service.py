@@ -450,9 +450,8 @@ class SecureDataService:
                 },
             ]
 
-            results = await self.db.encrypted_records.aggregate(pipeline).to_list(
-                length=None
-            )
+            cursor = await self.db.encrypted_records.aggregate(pipeline)
+            results = await cursor.to_list(length=None)
 
             inventory = {}
             for result in results:
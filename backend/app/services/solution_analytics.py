@@ -175,7 +175,7 @@ class SolutionAnalyticsService:
                 pipeline.insert(-1, {"$match": {"solution.stage": stage_filter}})
 
             # Execute aggregation
-            cursor = self.db.solution_ratings.aggregate(pipeline)
+            cursor = await self.db.solution_ratings.aggregate(pipeline)
             solutions = await cursor.to_list(None)
 
             # Decrypt solution and experience content
@@ -32,14 +32,48 @@ Usage Patterns:
 """
 
 import copy
+import json
 import logging
+import threading
 from functools import wraps
-from typing import Any, Dict
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
 
 from .encryption import encryption_manager
 
 logger = logging.getLogger(__name__)
 
+
+class _PlaintextCache:
+    """Thread-safe TTL cache of decrypted field plaintexts keyed by ciphertext.
+
+    A ciphertext always decrypts to the same plaintext (each write produces a
+    new ciphertext), so entries never go stale; the TTL only bounds how long
+    decrypted content stays in memory. Only the immutable plaintext string is
+    cached, so callers still parse it into fresh objects.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        # TTLCache isn't thread-safe, and status decryption runs on worker threads
+        self._lock = threading.Lock()
+
+    def decrypt(self, encrypted_value: str) -> str:
+        with self._lock:
+            plaintext = self._entries.get(encrypted_value)
+        if plaintext is None:
+            plaintext = encryption_manager.decrypt_string(encrypted_value)
+            with self._lock:
+                self._entries[encrypted_value] = plaintext
+        return plaintext
+
+
+# Solution content decrypted for the Stage 2/3 status endpoints, which clients
+# poll repeatedly while a solution is shown. Nothing else shares this cache.
+_status_plaintext_cache = _PlaintextCache(maxsize=1024, ttl=300)
+
+
 # Field encryption schema defining which fields require encryption for each model type
 ENCRYPTION_SCHEMA = {
     "User": {
@@ -102,7 +136,7 @@ class FieldEncryptor:
         self.encryption_manager = encryption_manager
 
     def encrypt_document(
-        self, document: Dict[str, Any], schema_name: str
+        self, document: Dict[str, Any], schema_name: str, inplace: bool = False
     ) -> Dict[str, Any]:
         """Encrypt specified fields in a document based on schema configuration.
 
@@ -115,6 +149,9 @@ class FieldEncryptor:
                 Can contain nested structures and mixed data types.
             schema_name: Name of encryption schema to use (e.g., "User", "Experience").
                 Must exist in ENCRYPTION_SCHEMA configuration.
+            inplace: Encrypt the given document directly instead of a deep copy.
+                Only safe when the caller owns the document and no longer needs
+                the plaintext; avoids copying fields that stay unencrypted.
 
         Returns:
             Dict[str, Any]: Document with specified fields encrypted and metadata added.
@@ -130,7 +167,7 @@ class FieldEncryptor:
         if schema_name not in ENCRYPTION_SCHEMA:
             return document
 
-        encrypted_doc = copy.deepcopy(document)
+        encrypted_doc = document if inplace else copy.deepcopy(document)
         schema = ENCRYPTION_SCHEMA[schema_name]
 
         for field_path, should_encrypt in schema.items():
@@ -150,7 +187,11 @@ class FieldEncryptor:
         return encrypted_doc
 
     def decrypt_document(
-        self, document: Dict[str, Any], schema_name: str
+        self,
+        document: Dict[str, Any],
+        schema_name: str,
+        inplace: bool = False,
+        plaintext_cache: Optional[_PlaintextCache] = None,
     ) -> Dict[str, Any]:
         """Decrypt specified fields in a document after database retrieval.
 
@@ -163,6 +204,11 @@ class FieldEncryptor:
                 Should contain _encryption metadata if fields are encrypted.
             schema_name: Name of encryption schema used for original encryption.
                 Must match the schema used during encryption process.
+            inplace: Decrypt the given document directly instead of a deep copy.
+                Only safe when the caller owns the document, e.g. one just
+                loaded from the database; saves copying large encrypted blobs.
+            plaintext_cache: Cache to decrypt field values through. Left unset,
+                every field is decrypted afresh and nothing is retained.
 
         Returns:
             Dict[str, Any]: Document with encrypted fields decrypted and metadata removed.
@@ -187,7 +233,7 @@ class FieldEncryptor:
         if schema_name not in ENCRYPTION_SCHEMA:
             return document
 
-        decrypted_doc = copy.deepcopy(document)
+        decrypted_doc = document if inplace else copy.deepcopy(document)
         schema = ENCRYPTION_SCHEMA[schema_name]
 
         for field_path, should_encrypt in schema.items():
@@ -195,7 +241,9 @@ class FieldEncryptor:
                 value = self._get_nested_value(decrypted_doc, field_path)
                 if value is not None:
                     try:
-                        decrypted_value = self._decrypt_field_value(value)
+                        decrypted_value = self._decrypt_field_value(
+                            value, plaintext_cache
+                        )
                         self._set_nested_value(
                             decrypted_doc, field_path, decrypted_value
                         )
@@ -236,7 +284,11 @@ class FieldEncryptor:
             # Convert to string first for primitive types
             return self.encryption_manager.encrypt_string(str(value))
 
-    def _decrypt_field_value(self, encrypted_value: str) -> Any:
+    def _decrypt_field_value(
+        self,
+        encrypted_value: str,
+        plaintext_cache: Optional[_PlaintextCache] = None,
+    ) -> Any:
         """Decrypt a single field value and restore original data type.
 
         Attempts to decrypt field values and restore their original data types.
@@ -250,19 +302,27 @@ class FieldEncryptor:
             Any: Decrypted value in original data type, or None if input was None.
 
         Decryption Strategy:
-            - First attempts object decryption (handles lists/dicts)
-            - Falls back to string decryption if object decryption fails
+            - Decrypts the ciphertext exactly once (or reads it from the
+              given plaintext cache)
+            - Parses the plaintext as JSON to restore lists/dicts
+            - Falls back to the plain string if it isn't JSON
             - Preserves original data types when possible
         """
         if encrypted_value is None:
             return None
 
+        # Decrypt once, then decide the type from the plaintext. Trying
+        # decrypt_object first and decrypt_string on failure ran the full
+        # Fernet verify+decrypt twice for every plain string field.
+        if plaintext_cache is not None:
+            decrypted = plaintext_cache.decrypt(encrypted_value)
+        else:
+            decrypted = self.encryption_manager.decrypt_string(encrypted_value)
         try:
-            # Try to decrypt as object first (for lists/dicts)
-            return self.encryption_manager.decrypt_object(encrypted_value)
-        except:
-            # If that fails, decrypt as string
-            return self.encryption_manager.decrypt_string(encrypted_value)
+            # Lists/dicts were JSON-serialized before encryption
+            return json.loads(decrypted)
+        except ValueError:
+            return decrypted
 
     def _get_nested_value(self, document: Dict[str, Any], path: str) -> Any:
         """Get value from nested dictionary structure using dot notation path.
@@ -541,6 +601,23 @@ def encrypt_solution_data(solution_data: Dict[str, Any]) -> Dict[str, Any]:
     return field_encryptor.encrypt_document(solution_data, "Solution")
 
 
+def encrypt_solution_data_inplace(solution_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Encrypt solution data fields in place according to Solution schema configuration.
+
+    Variant of encrypt_solution_data for documents built just to be stored, such
+    as freshly generated AI output. Skips the defensive deep copy, so plaintext
+    fields outside the schema (e.g. content.resources) are not duplicated.
+
+    Args:
+        solution_data: Dictionary containing solution information to encrypt.
+            Modified in place.
+
+    Returns:
+        Dict[str, Any]: The same dictionary with sensitive fields encrypted and metadata added.
+    """
+    return field_encryptor.encrypt_document(solution_data, "Solution", inplace=True)
+
+
 def decrypt_solution_data(solution_data: Dict[str, Any]) -> Dict[str, Any]:
     """Decrypt solution data fields according to Solution schema configuration.
 
@@ -555,3 +632,44 @@ def decrypt_solution_data(solution_data: Dict[str, Any]) -> Dict[str, Any]:
         Dict[str, Any]: Solution data with encrypted fields decrypted and metadata removed.
     """
     return field_encryptor.decrypt_document(solution_data, "Solution")
+
+
+def decrypt_solution_data_inplace(solution_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Decrypt solution data fields in place according to Solution schema configuration.
+
+    Variant of decrypt_solution_data for documents the caller owns, such as a
+    solution freshly loaded from the database. Skips the defensive deep copy,
+    which otherwise duplicates every encrypted content blob before decrypting.
+
+    Args:
+        solution_data: Dictionary containing encrypted solution information.
+            Modified in place.
+
+    Returns:
+        Dict[str, Any]: The same dictionary with encrypted fields decrypted and metadata removed.
+    """
+    return field_encryptor.decrypt_document(solution_data, "Solution", inplace=True)
+
+
+def decrypt_solution_status_inplace(solution_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Decrypt a solution in place for a polled status endpoint.
+
+    Variant of decrypt_solution_data_inplace for the Stage 2 and Stage 3
+    status endpoints. Field values go through a small TTL cache keyed by
+    ciphertext, so repeated polls of the same solution skip the decryption.
+    Only this function uses the cache; other decryption retains nothing.
+
+    Args:
+        solution_data: Dictionary containing encrypted solution information.
+            Modified in place.
+
+    Returns:
+        Dict[str, Any]: The same dictionary with encrypted fields decrypted and
+            metadata removed.
+    """
+    return field_encryptor.decrypt_document(
+        solution_data,
+        "Solution",
+        inplace=True,
+        plaintext_cache=_status_plaintext_cache,
+    )